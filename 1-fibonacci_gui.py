@@ -1,125 +1,96 @@
 """
-斐波那契数列计算实验程序
-包含5种核心算法：迭代法、迭代改进、递归法、公式法、矩阵法
+斐波那契数列计算实验程序（图形界面）
+算法与实验接口在 fibonacci_core.py 中，本文件只负责界面和输出
 """
 
 import time
 import math
 import sys
+import os
+import queue
+import threading
+import re
+
+import fibonacci_core
+from fibonacci_core import *
 from tkinter import *
-from tkinter import scrolledtext, messagebox
+from tkinter import scrolledtext, messagebox, filedialog
+
+# ==================== GUI部分 ====================
 
-# ==================== 核心算法部分 ====================
+OUTPUT_POLL_INTERVAL = 50        # 主线程刷新输出的间隔（毫秒），即每秒20帧
+OUTPUT_FLUSH_MAX_LINES = 2000    # 每帧最多写入文本框的行数，其余留到下一帧
+OUTPUT_MAX_LINES = 5000          # 文本框最多保留的行数，超出时删除最早的行
+ITERATIVE_MOD_MAX_N = 10 ** 6    # 取模计算时，缩减后的n不超过此值才运行迭代法
+RECURSIVE_VERIFY_MAX_N = 20000   # 序号不超过此值时，用记忆化递归验证边界
+TABLE_CONFIRM_BYTES = 100 * 2**20  # 预计的查表文件超过此大小时，生成前先确认
+BACKEND_LABELS = {"int": "Python int", "gmpy2": "gmpy2 (mpz)"}  # 大整数后端的显示名称
 
-def fibonacciIterative(n):
+
+class TaskCancelled(BaseException):
     """
-    迭代法：使用数组存储所有斐波那契数
-    时间复杂度：O(n)
-    空间复杂度：O(n)
+    后台任务被取消时抛出
+    继承BaseException，避免被算法代码中的 except Exception 吞掉
     """
-    if n <= 0:
-        return 0
-    if n == 1:
-        return 1
-    
-    fibArray = [0] * (n + 1)
-    fibArray[0] = 0
-    fibArray[1] = 1
-    
-    for i in range(2, n + 1):
-        fibArray[i] = fibArray[i - 1] + fibArray[i - 2]
-    
-    return fibArray[n]
-
 
-def fibonacciIterativeImproved(n):
+class OutputSink:
     """
-    迭代改进法：只保存最近的两个值，节省空间
-    时间复杂度：O(n)
-    空间复杂度：O(1)
+    GUI输出缓冲：任意线程写入，主线程按固定帧率批量写入文本框
+    - 超长数字串（已被转成字符串的大整数）在入队时截断为首尾
+    - 每帧写入行数有上限，文本框行数有上限，避免Tk插入成为主要开销
     """
-    if n <= 0:
-        return 0
-    if n == 1:
-        return 1
     
-    prev = 0
-    curr = 1
+    def __init__(self, textWidget, maxDigits=OUTPUT_MAX_DIGITS, maxLines=OUTPUT_MAX_LINES,
+                 flushMaxLines=OUTPUT_FLUSH_MAX_LINES):
+        self.textWidget = textWidget
+        self.maxDigits = maxDigits
+        self.maxLines = maxLines
+        self.flushMaxLines = flushMaxLines
+        self.pending = queue.Queue()
     
-    for i in range(2, n + 1):
-        nextVal = prev + curr
-        prev = curr
-        curr = nextVal
+    def formatNumber(self, value):
+        """按当前位数上限格式化整数"""
+        return formatNumber(value, self.maxDigits)
     
-    return curr
-
-
-def fibonacciRecursive(n):
-    """
-    递归法：直接递归计算
-    时间复杂度：O(2^n)
-    空间复杂度：O(n)
-    """
-    if n <= 0:
-        return 0
-    if n == 1:
-        return 1
-    return fibonacciRecursive(n - 1) + fibonacciRecursive(n - 2)
-
-
-def fibonacciFormula(n):
-    """
-    公式法：使用Binet公式 F(n) = (φ^n - ψ^n) / sqrt(5)
-    其中 φ = (1 + sqrt(5)) / 2, ψ = (1 - sqrt(5)) / 2
-    时间复杂度：O(1)
-    空间复杂度：O(1)
-    """
-    if n <= 0:
-        return 0
+    def shortenDigitRuns(self, text):
+        """兜底：把文本中超过位数上限的连续数字串截断为首尾"""
+        if self.maxDigits is None or len(text) <= self.maxDigits:
+            return text
+        edge = OUTPUT_EDGE_DIGITS
+        return re.sub(r"\d{%d,}" % (self.maxDigits + 1),
+                      lambda m: f"{m.group()[:edge]}...{m.group()[-edge:]}（共{len(m.group())}位）",
+                      text)
     
-    sqrt5 = math.sqrt(5)
-    phi = (1 + sqrt5) / 2
-    psi = (1 - sqrt5) / 2
+    def write(self, text):
+        """写入一条输出（可在任意线程调用）"""
+        self.pending.put(self.shortenDigitRuns(text))
     
-    result = (phi ** n - psi ** n) / sqrt5
-    return int(round(result))
-
-
-def fibonacciMatrix(n):
-    """
-    矩阵法：使用矩阵快速幂
-    时间复杂度：O(log n)
-    空间复杂度：O(1)
-    """
-    if n <= 0:
-        return 0
-    if n == 1:
-        return 1
-    
-    def matrixMultiply(A, B):
-        """矩阵乘法"""
-        return [
-            [A[0][0] * B[0][0] + A[0][1] * B[1][0], A[0][0] * B[0][1] + A[0][1] * B[1][1]],
-            [A[1][0] * B[0][0] + A[1][1] * B[1][0], A[1][0] * B[0][1] + A[1][1] * B[1][1]]
-        ]
-    
-    def matrixPower(matrix, power):
-        """矩阵快速幂"""
-        if power == 1:
-            return matrix
-        
-        if power % 2 == 0:
-            half = matrixPower(matrix, power // 2)
-            return matrixMultiply(half, half)
-        else:
-            return matrixMultiply(matrix, matrixPower(matrix, power - 1))
+    def flush(self):
+        """主线程调用：把积压的输出批量写入文本框，并裁剪过长的滚动历史"""
+        lines = []
+        try:
+            while len(lines) < self.flushMaxLines:
+                lines.append(self.pending.get_nowait())
+        except queue.Empty:
+            pass
+        if not lines:
+            return
+        
+        self.textWidget.insert(END, "\n".join(lines) + "\n")
+        lineCount = int(self.textWidget.index("end-1c").split(".")[0])
+        if lineCount > self.maxLines:
+            self.textWidget.delete("1.0", f"{lineCount - self.maxLines + 1}.0")
+        self.textWidget.see(END)
     
-    baseMatrix = [[1, 1], [1, 0]]
-    resultMatrix = matrixPower(baseMatrix, n)
-    return resultMatrix[0][1]
-
+    def clear(self):
+        """清空文本框和尚未写入的输出"""
+        try:
+            while True:
+                self.pending.get_nowait()
+        except queue.Empty:
+            pass
+        self.textWidget.delete("1.0", END)
 
-# ==================== GUI部分 ====================
 
 class FibonacciGUI:
     def __init__(self, root):
@@ -135,12 +106,39 @@ class FibonacciGUI:
         self.nEntry = Entry(inputFrame, width=20, font=("Arial", 12))
         self.nEntry.pack(side=LEFT, padx=5)
         
+        Label(inputFrame, text="缓存容量:", font=("Arial", 12)).pack(side=LEFT, padx=5)
+        self.cacheSizeEntry = Entry(inputFrame, width=8, font=("Arial", 12))
+        self.cacheSizeEntry.insert(0, str(FIB_CACHE_SIZE))
+        self.cacheSizeEntry.pack(side=LEFT, padx=5)
+        
+        self.cachePolicy = StringVar(value=fibonacciCache.policy)
+        OptionMenu(inputFrame, self.cachePolicy, *FIB_CACHE_POLICIES).pack(side=LEFT, padx=5)
+        
+        self.parallelCompare = BooleanVar(value=True)
+        Checkbutton(inputFrame, text="并行比较", variable=self.parallelCompare,
+                    font=("Arial", 12)).pack(side=LEFT, padx=5)
+        
+        inputFrame2 = Frame(root)
+        inputFrame2.pack(pady=5)
+        
+        Label(inputFrame2, text="整数位宽:", font=("Arial", 12)).pack(side=LEFT, padx=5)
+        self.bitsEntry = Entry(inputFrame2, width=8, font=("Arial", 12))
+        self.bitsEntry.pack(side=LEFT, padx=5)
+        
+        Label(inputFrame2, text="模数m:", font=("Arial", 12)).pack(side=LEFT, padx=5)
+        self.modEntry = Entry(inputFrame2, width=20, font=("Arial", 12))
+        self.modEntry.pack(side=LEFT, padx=5)
+        
+        Label(inputFrame2, text="大整数后端:", font=("Arial", 12)).pack(side=LEFT, padx=5)
+        self.intBackend = StringVar(value=intBackend)
+        OptionMenu(inputFrame2, self.intBackend, *INT_BACKENDS, command=setIntBackend).pack(side=LEFT, padx=5)
+        
         # 按钮框架
         buttonFrame = Frame(root)
         buttonFrame.pack(pady=10)
         
         # 功能按钮
-        Button(buttonFrame, text="功能2: 五种方法比较", command=self.compareFiveMethods, 
+        Button(buttonFrame, text="功能2: 多种方法比较", command=self.compareFiveMethods, 
                width=20, height=2, font=("Arial", 10)).pack(side=LEFT, padx=5)
         Button(buttonFrame, text="功能3: 迭代找最大序号", command=self.findMaxWithIterative, 
                width=20, height=2, font=("Arial", 10)).pack(side=LEFT, padx=5)
@@ -161,6 +159,14 @@ class FibonacciGUI:
         Button(buttonFrame3, text="功能7: 公式法找误差", command=self.findFormulaError, 
                width=20, height=2, font=("Arial", 10)).pack(side=LEFT, padx=5)
         
+        buttonFrame4 = Frame(root)
+        buttonFrame4.pack(pady=10)
+        
+        Button(buttonFrame4, text="功能8: 复杂度拟合", command=self.complexitySweep, 
+               width=20, height=2, font=("Arial", 10)).pack(side=LEFT, padx=5)
+        Button(buttonFrame4, text="功能9: 取模计算", command=self.computeModular, 
+               width=20, height=2, font=("Arial", 10)).pack(side=LEFT, padx=5)
+        
         # 输出文本框
         outputFrame = Frame(root)
         outputFrame.pack(pady=10, padx=10, fill=BOTH, expand=True)
@@ -170,408 +176,578 @@ class FibonacciGUI:
                                                      font=("Consolas", 10))
         self.outputText.pack(fill=BOTH, expand=True)
         
-        # 清空按钮
-        Button(root, text="清空输出", command=self.clearOutput, 
-               width=15, font=("Arial", 10)).pack(pady=5)
+        # 清空、取消按钮和任务状态
+        controlFrame = Frame(root)
+        controlFrame.pack(pady=5)
+        
+        Button(controlFrame, text="清空输出", command=self.clearOutput, 
+               width=15, font=("Arial", 10)).pack(side=LEFT, padx=5)
+        Button(controlFrame, text="取消任务", command=self.cancelTasks, 
+               width=15, font=("Arial", 10)).pack(side=LEFT, padx=5)
+        Button(controlFrame, text="导出比较结果", command=self.exportResults, 
+               width=15, font=("Arial", 10)).pack(side=LEFT, padx=5)
+        Button(controlFrame, text="生成查表", command=self.buildTable, 
+               width=15, font=("Arial", 10)).pack(side=LEFT, padx=5)
+        Label(controlFrame, text="显示位数上限:", font=("Arial", 10)).pack(side=LEFT, padx=5)
+        self.digitLimitEntry = Entry(controlFrame, width=8, font=("Arial", 10))
+        self.digitLimitEntry.insert(0, str(OUTPUT_MAX_DIGITS))
+        self.digitLimitEntry.pack(side=LEFT, padx=5)
+        self.statusLabel = Label(controlFrame, text="无运行中的任务", font=("Arial", 10), fg="blue")
+        self.statusLabel.pack(side=LEFT, padx=5)
+        
+        # 后台任务: 线程 -> (任务名, 取消事件)；输出经缓冲按帧交给主线程写入文本框
+        self.tasks = {}
+        self.lastBenchmarkResults = []
+        self.output = OutputSink(self.outputText)
+        self.root.after(OUTPUT_POLL_INTERVAL, self.pollOutput)
+        
+        # 启动时加载已有的预计算表
+        try:
+            table = loadFibonacciTable()
+            if table is not None:
+                self.appendOutput(f"已加载预计算表: F(0)..F({len(table) - 1}) ({FIB_TABLE_PATH})")
+        except (OSError, ValueError) as e:
+            self.appendOutput(f"预计算表加载失败: {str(e)}")
     
     def clearOutput(self):
         """清空输出文本框"""
-        self.outputText.delete(1.0, END)
+        self.output.clear()
     
     def appendOutput(self, text):
-        """追加输出文本"""
-        self.outputText.insert(END, text + "\n")
-        self.outputText.see(END)
-        self.root.update()
+        """追加输出文本（可在后台线程调用，实际写入由主线程完成）"""
+        self.checkCancelled()
+        self.output.write(text)
+    
+    def formatNumber(self, value):
+        """按界面设置的位数上限格式化大整数"""
+        return self.output.formatNumber(value)
+    
+    def pollOutput(self):
+        """主线程按固定帧率把缓冲的输出写入文本框，并刷新任务状态"""
+        self.output.flush()
+        
+        names = [name for name, _ in list(self.tasks.values())]
+        self.statusLabel.config(text=f"运行中: {', '.join(names)}" if names else "无运行中的任务")
+        self.root.after(OUTPUT_POLL_INTERVAL, self.pollOutput)
+    
+    def configureDigitLimit(self):
+        """读取显示位数上限，非法时提示并返回False"""
+        try:
+            maxDigits = int(self.digitLimitEntry.get())
+            if maxDigits < 2 * OUTPUT_EDGE_DIGITS:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", f"显示位数上限必须是不小于{2 * OUTPUT_EDGE_DIGITS}的整数")
+            return False
+        self.output.maxDigits = maxDigits
+        return True
+    
+    def runInBackground(self, taskName, func, *args):
+        """在后台线程中运行func(*args)，界面保持响应，可同时运行多个任务"""
+        if not self.configureDigitLimit():
+            return
+        cancelEvent = threading.Event()
+        worker = threading.Thread(target=self.runTask, args=(taskName, func, args), daemon=True)
+        self.tasks[worker] = (taskName, cancelEvent)
+        worker.start()
+    
+    def runTask(self, taskName, func, args):
+        """后台线程入口：捕获取消和异常，结束后注销任务"""
+        try:
+            func(*args)
+        except TaskCancelled:
+            self.output.write(f"[{taskName}] 任务已取消\n")
+        except Exception as e:
+            self.output.write(f"[{taskName}] 发生错误: {str(e)}\n")
+        finally:
+            self.tasks.pop(threading.current_thread(), None)
+    
+    def cancelTasks(self):
+        """请求取消所有运行中的任务（在下一个检查点生效）"""
+        for _, cancelEvent in list(self.tasks.values()):
+            cancelEvent.set()
+    
+    def isCancelled(self):
+        """当前线程对应的任务是否已被取消"""
+        task = self.tasks.get(threading.current_thread())
+        return task is not None and task[1].is_set()
+    
+    def checkCancelled(self):
+        """任务已被取消时抛出TaskCancelled，用于长循环中的检查点"""
+        if self.isCancelled():
+            raise TaskCancelled()
+    
+    def configureCache(self):
+        """按输入框设置共享缓存的容量和淘汰策略，返回是否成功"""
+        try:
+            fibonacciCache.configure(int(self.cacheSizeEntry.get()), self.cachePolicy.get())
+            return True
+        except ValueError as e:
+            messagebox.showerror("错误", f"缓存设置无效: {str(e)}")
+            return False
+    
+    def readBound(self):
+        """
+        读取整数上界：位宽为空时使用 sys.maxsize，否则为该位宽有符号整数的最大值 2^(w-1)-1
+        输入无效返回None
+        """
+        text = self.bitsEntry.get().strip()
+        if not text:
+            return sys.maxsize
+        try:
+            bits = int(text)
+        except ValueError:
+            bits = 0
+        if bits < 2:
+            messagebox.showerror("错误", "整数位宽必须为不小于2的整数")
+            return None
+        return (1 << (bits - 1)) - 1
+    
+    def appendCacheStats(self):
+        """输出共享缓存的命中统计"""
+        self.appendOutput(f"缓存统计: {fibonacciCache.stats()}")
     
     def compareFiveMethods(self):
-        """功能2: 对相同输入n，用5种方法计算并比较"""
+        """功能2: 对相同输入n，用多种方法计算并比较"""
         try:
             n = int(self.nEntry.get())
-            if n < 0:
-                messagebox.showerror("错误", "n值必须为非负整数")
-                return
-            
-            self.appendOutput(f"\n{'='*60}")
-            self.appendOutput(f"功能2: 计算第{n}个斐波那契数（五种方法比较）")
-            self.appendOutput(f"{'='*60}\n")
-            
-            methods = [
-                ("迭代法（数组）", fibonacciIterative),
-                ("迭代改进法", fibonacciIterativeImproved),
-                ("递归法", fibonacciRecursive),
-                ("公式法", fibonacciFormula),
-                ("矩阵法", fibonacciMatrix)
-            ]
-            
-            results = []
-            
-            for methodName, methodFunc in methods:
-                startTime = time.time()
-                try:
-                    if methodName == "递归法" and n > 35:
-                        self.appendOutput(f"{methodName}: 跳过（n={n}太大，递归会非常慢）")
-                        continue
-                    
-                    result = methodFunc(n)
-                    endTime = time.time()
-                    elapsedTime = (endTime - startTime) * 1000  # 转换为毫秒
-                    
-                    # 估算基本操作次数
-                    if methodName == "迭代法（数组）":
-                        operations = n
-                    elif methodName == "迭代改进法":
-                        operations = n
-                    elif methodName == "递归法":
-                        operations = 2 ** n  # 近似
-                    elif methodName == "公式法":
-                        operations = 1
-                    else:  # 矩阵法
-                        operations = int(math.log2(n)) if n > 0 else 0
-                    
-                    results.append({
-                        'name': methodName,
-                        'result': result,
-                        'time': elapsedTime,
-                        'operations': operations
-                    })
-                    
-                    self.appendOutput(f"{methodName}:")
-                    self.appendOutput(f"  结果: {result}")
-                    self.appendOutput(f"  执行时间: {elapsedTime:.6f} 毫秒")
-                    self.appendOutput(f"  估算基本操作次数: {operations}")
-                    self.appendOutput("")
-                    
-                except Exception as e:
-                    self.appendOutput(f"{methodName}: 计算失败 - {str(e)}\n")
-            
-            # 验证结果一致性
-            if len(results) > 1:
-                firstResult = results[0]['result']
-                allSame = all(r['result'] == firstResult for r in results)
-                if allSame:
-                    self.appendOutput(f"✓ 所有方法结果一致: {firstResult}")
-                else:
-                    self.appendOutput("⚠ 警告: 不同方法的结果不一致！")
-                    for r in results:
-                        self.appendOutput(f"  {r['name']}: {r['result']}")
-            
         except ValueError:
             messagebox.showerror("错误", "请输入有效的整数")
-        except Exception as e:
-            messagebox.showerror("错误", f"发生错误: {str(e)}")
+            return
+        if n < 0:
+            messagebox.showerror("错误", "n值必须为非负整数")
+            return
+        
+        self.runInBackground("功能2", self.compareFiveMethodsTask, n, self.parallelCompare.get())
+    
+    def compareFiveMethodsTask(self, n, parallel=False):
+        """功能2后台任务：parallel为True时各方法在独立子进程中并发运行，结果按完成顺序输出"""
+        self.appendOutput(f"\n{'='*60}")
+        self.appendOutput(f"功能2: 计算第{n}个斐波那契数（多种方法比较）")
+        self.appendOutput(f"{'='*60}\n")
+        # 后端可在运行时切换，需读取模块中的当前值而不是导入时的副本
+        self.appendOutput(f"大整数后端: {BACKEND_LABELS[fibonacci_core.intBackend]}"
+                          f"{'' if gmpy2 is not None else '（未安装gmpy2）'}")
+        if parallel:
+            self.appendOutput(f"并行模式: 每个方法独立子进程，单个方法期限 {COMPARE_TIMEOUT} 秒\n")
+        
+        startTime = time.perf_counter()
+        records = compareMethods(n, onResult=self.appendCompareRecord, parallel=parallel,
+                                 shouldStop=self.isCancelled)
+        self.checkCancelled()
+        elapsedTime = time.perf_counter() - startTime
+        results = [record for record in records if record['status'] == "ok"]
+        
+        self.lastBenchmarkResults = results
+        
+        # 验证结果一致性
+        if len(results) > 1:
+            firstResult = results[0]['result']
+            allSame = all(r['result'] == firstResult for r in results)
+            if allSame:
+                self.appendOutput(f"✓ 所有方法结果一致: {self.formatNumber(firstResult)}")
+            else:
+                self.appendOutput("⚠ 警告: 不同方法的结果不一致！")
+                for r in results:
+                    self.appendOutput(f"  {r['name']}: {self.formatNumber(r['result'])}")
+        self.appendOutput(f"比较总耗时: {elapsedTime:.3f} 秒\n")
+    
+    def appendCompareRecord(self, record):
+        """输出功能2中一个方法的比较记录"""
+        methodName = record['name']
+        if record['status'] == "skipped":
+            self.appendOutput(f"{methodName}: 跳过（{record['reason']}）")
+            return
+        if record['status'] == "timeout":
+            self.appendOutput(f"{methodName}: 超时（{record['reason']}）\n")
+            return
+        if record['status'] != "ok":
+            self.appendOutput(f"{methodName}: 计算失败 - {record['reason']}\n")
+            return
+        
+        self.appendOutput(f"{methodName}:")
+        self.appendOutput(f"  结果: {self.formatNumber(record['result'])}")
+        self.appendOutput(f"  大整数后端: {BACKEND_LABELS[record['backend']]}")
+        self.appendOutput(f"  执行时间: 最小 {record['minMs']:.6f} 毫秒, "
+                          f"中位数 {record['medianMs']:.6f} 毫秒, "
+                          f"P95 {record['p95Ms']:.6f} 毫秒")
+        self.appendOutput(f"  计时方式: {record['repeat']} 次重复 × 每次 {record['loops']} 次调用")
+        self.appendOutput(f"  基本操作次数: {record['additions'] + record['multiplications']}"
+                          f"（加减法 {record['additions']}, 乘法 {record['multiplications']}）")
+        if record['peakMemoryBytes'] is None and methodName == "递归法":
+            self.appendOutput(f"  峰值内存: 未测量（n>{MEMORY_PROBE_RECURSIVE_MAX_N}时tracemalloc开销过大）")
+        elif record['peakMemoryBytes'] is None:
+            self.appendOutput("  峰值内存: 未测量（测量子进程出错或超时）")
+        else:
+            self.appendOutput(f"  峰值内存: {record['peakMemoryBytes'] / 1024:.2f} KB")
+        self.appendOutput("")
+    
+    def exportResults(self):
+        """把最近一次功能2的比较结果导出为CSV或JSON"""
+        if not self.lastBenchmarkResults:
+            messagebox.showwarning("警告", "请先执行功能2")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            exportBenchmarkResults(self.lastBenchmarkResults, path)
+            self.appendOutput(f"比较结果已导出到: {path}\n")
+        except OSError as e:
+            messagebox.showerror("错误", f"导出失败: {str(e)}")
+    
+    def buildTable(self):
+        """生成预计算查表文件：最大序号取自n输入框，为空时使用默认值"""
+        text = self.nEntry.get().strip()
+        try:
+            maxN = int(text) if text else FIB_TABLE_MAX_N
+        except ValueError:
+            maxN = -1
+        if maxN < 0:
+            messagebox.showerror("错误", "最大序号必须为非负整数")
+            return
+        # 文件大小随最大序号平方增长，n输入框里可能还留着其他功能用的大n
+        estimatedBytes = estimateTableBytes(maxN)
+        if estimatedBytes > TABLE_CONFIRM_BYTES and not messagebox.askyesno(
+                "确认", f"生成 F(0)..F({maxN}) 的查表文件预计约 {estimatedBytes / 2**20:,.0f} MB，是否继续？"):
+            return
+        self.runInBackground("生成查表", self.buildTableTask, maxN)
+    
+    def buildTableTask(self, maxN):
+        """生成查表后台任务：先卸载旧表再替换文件，完成后重新加载"""
+        self.appendOutput(f"\n正在生成预计算表 F(0)..F({maxN})...")
+        unloadFibonacciTable()
+        startTime = time.perf_counter()
+        buildFibonacciTable(FIB_TABLE_PATH, maxN)
+        elapsedTime = time.perf_counter() - startTime
+        table = loadFibonacciTable()
+        self.appendOutput(f"已生成并加载: {FIB_TABLE_PATH}（{os.path.getsize(FIB_TABLE_PATH) / 2**20:.2f} MB，"
+                          f"耗时 {elapsedTime:.2f} 秒），共 {len(table)} 项\n")
     
     def findMaxWithIterative(self):
         """功能3: 用迭代算法找不超过最大整数的斐波那契数序号"""
+        bound = self.readBound()
+        if bound is None:
+            return
+        self.runInBackground("功能3", self.findMaxWithIterativeTask, bound)
+    
+    def findMaxWithIterativeTask(self, bound):
+        """功能3后台任务"""
         self.appendOutput(f"\n{'='*60}")
         self.appendOutput("功能3: 迭代算法寻找最大斐波那契数序号")
         self.appendOutput(f"{'='*60}\n")
         
-        # 确定最大整数
-        maxInt = sys.maxsize
-        self.appendOutput(f"系统支持的最大整数: {maxInt}")
-        self.appendOutput(f"整数位数: {maxInt.bit_length()} 位\n")
+        self.appendOutput(f"最大整数: {self.formatNumber(bound)}")
+        self.appendOutput(f"整数位数: {bound.bit_length()} 位\n")
         
-        startTime = time.time()
-        n = 0
-        prev = 0
-        curr = 1
-        
-        while curr <= maxInt:
-            n += 1
-            if n == 1:
-                continue
-            
-            nextVal = prev + curr
-            if nextVal > maxInt:
-                break
-            
-            prev = curr
-            curr = nextVal
-        
-        endTime = time.time()
-        elapsedTime = (endTime - startTime) * 1000
+        # 对数估计 + 快速倍增修正；上界不大时，逐项迭代交叉验证
+        result = findMaxIndex(bound, shouldStop=self.isCancelled)
+        self.checkCancelled()
+        n = result["n"]
         
+        self.appendOutput("【对数估计 + 快速倍增】")
         self.appendOutput(f"最大斐波那契数序号: {n}")
-        self.appendOutput(f"第{n}个斐波那契数: {curr}")
-        self.appendOutput(f"执行时间: {elapsedTime:.6f} 毫秒")
-        self.appendOutput(f"第{n+1}个斐波那契数会溢出（值为: {prev + curr}）\n")
+        self.appendOutput(f"第{n}个斐波那契数: {self.formatNumber(result['value'])}")
+        self.appendOutput(f"执行时间: {result['solveMs']:.6f} 毫秒")
+        self.appendOutput(f"第{n+1}个斐波那契数会溢出（值为: {self.formatNumber(fibonacciDoubling(n + 1))}）\n")
+        
+        if result["scanN"] is not None:
+            self.appendOutput("【逐项迭代】")
+            self.appendOutput(f"最大斐波那契数序号: {result['scanN']}")
+            self.appendOutput(f"执行时间: {result['scanMs']:.6f} 毫秒")
+            self.appendOutput(f"{'✓ 两种方法结果一致' if result['scanN'] == n else '⚠ 警告: 两种方法结果不一致！'}\n")
         
         # 保存结果供功能5使用
         self.maxN = n
     
     def findMaxWithRecursive(self):
         """功能4: 用递归算法找不超过最大整数的斐波那契数序号"""
+        bound = self.readBound()
+        if bound is None:
+            return
+        if not self.configureCache():
+            return
+        self.runInBackground("功能4", self.findMaxWithRecursiveTask, bound)
+    
+    def findMaxWithRecursiveTask(self, bound):
+        """功能4后台任务"""
         self.appendOutput(f"\n{'='*60}")
         self.appendOutput("功能4: 递归算法寻找最大斐波那契数序号")
         self.appendOutput(f"{'='*60}\n")
-        self.appendOutput("注意: 递归算法效率很低，将使用迭代法先找到范围，再用递归验证\n")
+        self.appendOutput("注意: 递归算法效率很低，将先用对数估计找到序号，再用记忆化递归验证\n")
         
-        maxInt = sys.maxsize
-        self.appendOutput(f"系统支持的最大整数: {maxInt}\n")
+        self.appendOutput(f"最大整数: {self.formatNumber(bound)}\n")
         
-        # 先用迭代法找到大概范围
         startTime = time.time()
-        n = 0
-        prev = 0
-        curr = 1
+        n, value = findMaxFibonacciIndex(bound)
+        solveTime = (time.time() - startTime) * 1000
         
-        while curr <= maxInt:
-            n += 1
-            if n == 1:
-                continue
-            nextVal = prev + curr
-            if nextVal > maxInt:
-                break
-            prev = curr
-            curr = nextVal
-        
-        # 用递归验证边界
-        self.appendOutput(f"使用迭代法找到的最大序号: {n}")
-        self.appendOutput(f"开始用递归法验证...\n")
-        
-        # 递归验证（只验证几个关键值，因为递归太慢）
-        testValues = [n - 2, n - 1, n] if n > 2 else [n]
-        for testN in testValues:
-            recStart = time.time()
-            try:
-                recResult = fibonacciRecursive(testN)
-                recEnd = time.time()
-                recTime = (recEnd - recStart) * 1000
-                self.appendOutput(f"递归计算 F({testN}) = {recResult}, 耗时: {recTime:.2f} 毫秒")
-                if recResult > maxInt:
-                    self.appendOutput(f"F({testN}) 超过最大整数")
+        self.appendOutput(f"对数估计 + 快速倍增找到的最大序号: {n}, 耗时: {solveTime:.6f} 毫秒")
+        
+        if n <= RECURSIVE_VERIFY_MAX_N:
+            self.appendOutput(f"开始用记忆化递归验证...\n")
+            
+            # 记忆化递归验证（结果保存在共享缓存中，供功能5、6复用）
+            testValues = [n - 2, n - 1, n, n + 1] if n > 2 else [n, n + 1]
+            for testN in testValues:
+                recStart = time.time()
+                try:
+                    recResult = fibonacciRecursiveMemo(testN)
+                    recEnd = time.time()
+                    recTime = (recEnd - recStart) * 1000
+                    self.appendOutput(f"递归计算 F({testN}) = {self.formatNumber(recResult)}, 耗时: {recTime:.2f} 毫秒")
+                    if recResult > bound:
+                        self.appendOutput(f"F({testN}) 超过最大整数")
+                        break
+                except Exception as e:
+                    self.appendOutput(f"递归计算 F({testN}) 失败: {str(e)}")
                     break
-            except Exception as e:
-                self.appendOutput(f"递归计算 F({testN}) 失败: {str(e)}")
-                break
+        else:
+            self.appendOutput(f"序号超过{RECURSIVE_VERIFY_MAX_N}，跳过递归验证")
         
         endTime = time.time()
         elapsedTime = (endTime - startTime) * 1000
         
         self.appendOutput(f"\n总执行时间: {elapsedTime:.6f} 毫秒")
-        self.appendOutput(f"最大斐波那契数序号: {n} (主要由迭代法确定)\n")
+        self.appendOutput(f"最大斐波那契数序号: {n}")
+        self.appendCacheStats()
+        self.appendOutput("")
     
     def recursiveComputeMax(self):
         """功能5: 用递归方式计算第n个斐波那契数（n来自功能3），看是否能在1分钟内完成"""
         if not hasattr(self, 'maxN'):
             messagebox.showwarning("警告", "请先执行功能3获取最大序号n")
             return
-        
-        n = self.maxN
+        if not self.configureCache():
+            return
+        self.runInBackground("功能5", self.recursiveComputeMaxTask, self.maxN)
+    
+    def recursiveComputeMaxTask(self, n):
+        """功能5后台任务"""
         self.appendOutput(f"\n{'='*60}")
         self.appendOutput(f"功能5: 递归计算第{n}个斐波那契数（1分钟限制）")
         self.appendOutput(f"{'='*60}\n")
         
+        # 记忆化递归：复用功能4等之前写入共享缓存的结果
+        memoStart = time.time()
+        memoResult = fibonacciRecursiveMemo(n)
+        memoTime = (time.time() - memoStart) * 1000
+        self.appendOutput("【记忆化递归】")
+        self.appendOutput(f"F({n}) = {self.formatNumber(memoResult)}, 耗时: {memoTime:.6f} 毫秒")
+        self.appendCacheStats()
+        self.appendOutput("")
+        
+        self.appendOutput("【普通递归】")
         self.appendOutput(f"开始递归计算 F({n})...")
         self.appendOutput("警告: 递归算法效率极低，可能需要很长时间\n")
         
-        startTime = time.time()
         timeout = 60  # 60秒超时
         
-        try:
-            # 使用一个简单的递归包装器来检测超时
-            result = None
-            exceptionOccurred = False
-            
-            def recursiveWithTimeout(n, startTime, timeout):
-                if time.time() - startTime > timeout:
-                    return None, True
-                if n <= 0:
-                    return 0, False
-                if n == 1:
-                    return 1, False
-                
-                result1, timeout1 = recursiveWithTimeout(n - 1, startTime, timeout)
-                if timeout1:
-                    return None, True
-                
-                result2, timeout2 = recursiveWithTimeout(n - 2, startTime, timeout)
-                if timeout2:
-                    return None, True
-                
-                return result1 + result2, False
-            
-            result, timedOut = recursiveWithTimeout(n, startTime, timeout)
-            
-            endTime = time.time()
-            elapsedTime = endTime - startTime
-            
-            if timedOut:
-                self.appendOutput(f"✗ 超时！在60秒内无法完成计算")
-                self.appendOutput(f"已用时间: {elapsedTime:.2f} 秒")
-            else:
-                self.appendOutput(f"✓ 计算完成！")
-                self.appendOutput(f"结果: F({n}) = {result}")
-                self.appendOutput(f"执行时间: {elapsedTime:.6f} 秒")
-                if elapsedTime < 60:
-                    self.appendOutput(f"在1分钟内完成（剩余时间: {60 - elapsedTime:.2f} 秒）")
-                else:
-                    self.appendOutput(f"超过1分钟限制")
+        # 在子进程中运行未修改的递归算法，超时即强制结束，计时不受超时检测影响
+        status, result, elapsedTime = runWithTimeout(fibonacciRecursive, (n,), timeout,
+                                                     shouldStop=self.isCancelled)
+        self.checkCancelled()
         
-        except Exception as e:
-            endTime = time.time()
-            elapsedTime = endTime - startTime
-            self.appendOutput(f"计算失败: {str(e)}")
+        if status == "timeout":
+            self.appendOutput(f"✗ 超时！在60秒内无法完成计算")
+            self.appendOutput(f"已用时间: {elapsedTime:.2f} 秒\n")
+        elif status == "ok":
+            self.appendOutput(f"✓ 计算完成！")
+            self.appendOutput(f"结果: F({n}) = {self.formatNumber(result)}")
+            self.appendOutput(f"执行时间: {elapsedTime:.6f} 秒")
+            self.appendOutput(f"在1分钟内完成（剩余时间: {timeout - elapsedTime:.2f} 秒）\n")
+        else:
+            self.appendOutput(f"计算失败: {result}")
             self.appendOutput(f"已用时间: {elapsedTime:.2f} 秒\n")
     
     def findMaxIn30Seconds(self):
-        """功能6: 找30秒内能计算的最大斐波那契数序号（递归和迭代）"""
+        """功能6: 找30秒内能计算的最大斐波那契数序号（标定采样 + 外推 + 确认）"""
+        if not self.configureCache():
+            return
+        self.runInBackground("功能6", self.findMaxIn30SecondsTask)
+    
+    def findMaxIn30SecondsTask(self):
+        """功能6后台任务"""
         self.appendOutput(f"\n{'='*60}")
         self.appendOutput("功能6: 30秒内能计算的最大斐波那契数序号")
         self.appendOutput(f"{'='*60}\n")
         
         timeout = 30  # 30秒
-        
-        # 递归算法
-        self.appendOutput("【递归算法】")
-        self.appendOutput("开始测试...\n")
-        
         recMaxN = 0
-        recStartTime = time.time()
-        
-        for n in range(1, 50):  # 递归很慢，从小的开始
-            if time.time() - recStartTime > timeout:
-                break
+        for methodName, methodFunc, model in TIME_BUDGET_METHODS:
+            self.appendOutput(f"【{methodName}】")
+            self.appendOutput(f"标定采样（{'指数模型 t ∝ φ^n' if model == 'exponential' else '幂律模型 t ∝ n^k'}）...")
             
-            testStart = time.time()
-            try:
-                result = fibonacciRecursive(n)
-                testEnd = time.time()
-                testTime = testEnd - testStart
-                
-                if testTime < timeout - (time.time() - recStartTime):
-                    recMaxN = n
-                    self.appendOutput(f"F({n}) = {result}, 耗时: {testTime:.3f} 秒")
-                else:
-                    break
-            except:
-                break
-        
-        recTotalTime = time.time() - recStartTime
-        self.appendOutput(f"\n递归算法最大序号: {recMaxN}")
-        self.appendOutput(f"总耗时: {recTotalTime:.2f} 秒")
-        
-        # 计算下一个的时间
-        if recMaxN > 0:
-            nextN = recMaxN + 1
-            self.appendOutput(f"\n计算下一个 F({nextN})...")
-            nextStart = time.time()
-            try:
-                nextResult = fibonacciRecursive(nextN)
-                nextEnd = time.time()
-                nextTime = nextEnd - nextStart
-                self.appendOutput(f"F({nextN}) = {nextResult}, 耗时: {nextTime:.3f} 秒")
-            except Exception as e:
-                self.appendOutput(f"计算失败: {str(e)}")
-        
-        # 迭代算法
-        self.appendOutput(f"\n【迭代算法】")
-        self.appendOutput("开始测试...\n")
-        
-        iterMaxN = 0
-        iterStartTime = time.time()
-        
-        n = 1
-        prev = 0
-        curr = 1
-        
-        while time.time() - iterStartTime < timeout:
-            if n == 1:
-                iterMaxN = n
-                n += 1
-                continue
-            
-            nextVal = prev + curr
-            if nextVal > sys.maxsize:
-                break
-            
-            testStart = time.time()
-            # 迭代计算很快，直接计算到n
-            for i in range(iterMaxN + 1, n + 1):
-                if i == 1:
-                    continue
-                temp = prev + curr
-                prev = curr
-                curr = temp
+            result = timeBudgetMethod(
+                methodName, methodFunc, model, timeout,
+                onSample=lambda n, t: self.appendOutput(f"  n = {n}, 耗时: {t:.6f} 秒"),
+                shouldStop=self.isCancelled)
+            self.checkCancelled()
             
-            testEnd = time.time()
-            testTime = testEnd - testStart
+            if model == "exponential":
+                self.appendOutput(f"拟合增长率: 每增加1耗时 ×{math.exp(result['exponent']):.4f}（φ ≈ 1.6180）")
+            else:
+                self.appendOutput(f"拟合复杂度指数: k = {result['exponent']:.3f}")
+            self.appendOutput(f"预测边界: n = {result['predictedN']}")
+            for runN, status, runTime in result["runs"]:
+                statusText = {"ok": "完成", "timeout": "超时"}.get(status, status)
+                self.appendOutput(f"确认运行 n = {runN}: {statusText}, 耗时: {runTime:.3f} 秒")
             
-            iterMaxN = n
-            if n % 1000 == 0 or n < 100:  # 只输出部分结果
-                self.appendOutput(f"F({n}) = {curr}, 耗时: {testTime:.6f} 秒")
+            self.appendOutput(f"{methodName}最大序号: {result['n']}"
+                              f"{'' if result['confirmed'] else '（未经确认，取采样中的最大值）'}")
+            self.appendOutput(f"该序号耗时: {result['time']:.3f} 秒, 搜索总耗时: {result['totalTime']:.2f} 秒\n")
             
-            n += 1
-            if n > 1000000:  # 防止无限循环
-                break
-        
-        iterTotalTime = time.time() - iterStartTime
-        self.appendOutput(f"\n迭代算法最大序号: {iterMaxN}")
-        self.appendOutput(f"总耗时: {iterTotalTime:.2f} 秒")
-        
-        # 计算下一个的时间
-        if iterMaxN > 0:
-            nextN = iterMaxN + 1
-            self.appendOutput(f"\n计算下一个 F({nextN})...")
-            nextStart = time.time()
-            nextResult = fibonacciIterativeImproved(nextN)
-            nextEnd = time.time()
-            nextTime = nextEnd - nextStart
-            self.appendOutput(f"F({nextN}) = {nextResult}, 耗时: {nextTime:.6f} 秒")
+            if methodName == "递归法":
+                recMaxN = result["n"]
+        
+        # 记忆化递归：同样的序号范围，之前算过的值直接命中缓存
+        self.appendOutput(f"【记忆化递归】")
+        memoStart = time.time()
+        for n in range(1, recMaxN + 2):
+            self.checkCancelled()
+            fibonacciRecursiveMemo(n)
+        memoTime = time.time() - memoStart
+        self.appendOutput(f"F(1)..F({recMaxN + 1}) 全部计算完成, 总耗时: {memoTime:.6f} 秒")
+        self.appendCacheStats()
         
         self.appendOutput("")
     
     def findFormulaError(self):
         """功能7: 用公式法找出出现误差时的最小n值"""
+        self.runInBackground("功能7", self.findFormulaErrorTask)
+    
+    def findFormulaErrorTask(self):
+        """功能7后台任务"""
         self.appendOutput(f"\n{'='*60}")
         self.appendOutput("功能7: 公式法找出误差时的最小n值")
         self.appendOutput(f"{'='*60}\n")
         
-        self.appendOutput("比较公式法和迭代法的结果，找出第一个不一致的n值...\n")
+        self.appendOutput(f"一次线性扫描 n=1..{FORMULA_SCAN_MAX_N}，精确值逐项递推，"
+                          f"同时比较各精度下的公式法结果...\n")
         
-        maxN = 100  # 先测试到100
-        errorN = None
+        records = formulaErrorSearch(1, FORMULA_SCAN_MAX_N)
+        if np is None:
+            self.appendOutput("未安装NumPy，跳过float32和longdouble\n")
         
-        for n in range(1, maxN + 1):
-            formulaResult = fibonacciFormula(n)
-            iterativeResult = fibonacciIterativeImproved(n)
-            
-            if formulaResult != iterativeResult:
-                errorN = n
-                self.appendOutput(f"✗ 发现误差！")
-                self.appendOutput(f"n = {n}")
-                self.appendOutput(f"公式法结果: {formulaResult}")
-                self.appendOutput(f"迭代法结果: {iterativeResult}")
-                self.appendOutput(f"误差: {abs(formulaResult - iterativeResult)}")
-                break
-            
-            if n % 10 == 0:
-                self.appendOutput(f"已测试到 n={n}, 结果一致")
+        self.appendOutput(f"  {'精度':<12}{'有效位数':>8}{'首个误差n':>12}")
+        for record in records:
+            firstN = record["firstN"] if record["firstN"] is not None else "无"
+            self.appendOutput(f"  {record['precision']:<12}{record['digits']:>8}{firstN:>12}")
+        self.appendOutput("")
+        
+        for record in records:
+            self.appendOutput(f"【{record['precision']}】")
+            if record["firstN"] is None:
+                self.appendOutput(f"在 n=1 到 n={FORMULA_SCAN_MAX_N} 范围内未发现误差\n")
+                continue
+            formulaText = "溢出" if record["formula"] is None else self.formatNumber(record["formula"])
+            self.appendOutput(f"✗ 最小误差n值: {record['firstN']}")
+            self.appendOutput(f"公式法结果: {formulaText}")
+            self.appendOutput(f"迭代法结果: {self.formatNumber(record['exact'])}")
+            self.appendOutput("误差增长曲线（出现误差之后）:")
+            for n, error, relError in record["curve"]:
+                if n >= record["firstN"]:
+                    errorText = "溢出" if error == float('inf') else self.formatNumber(error)
+                    self.appendOutput(f"  n = {n:>5}, 绝对误差 {errorText}, 相对误差 {relError:.3e}")
+            self.appendOutput("")
+        
+        if records:
+            self.appendOutput(f"扫描耗时: {records[0]['elapsedMs']:.6f} 毫秒")
+        self.appendOutput("")
+
+    def complexitySweep(self):
+        """功能8: 在几何增长的n上扫描各方法的耗时，拟合实测复杂度"""
+        self.runInBackground("功能8", self.complexitySweepTask)
+    
+    def complexitySweepTask(self):
+        """功能8后台任务"""
+        self.appendOutput(f"\n{'='*60}")
+        self.appendOutput("功能8: 复杂度扫描与拟合（n 按2倍增长）")
+        self.appendOutput(f"{'='*60}\n")
         
-        if errorN is None:
-            self.appendOutput(f"在 n=1 到 n={maxN} 范围内未发现误差")
-            self.appendOutput("继续扩大测试范围...\n")
+        summary = []
+        for methodName, methodFunc, _ in FIBONACCI_METHODS:
+            maxN = min(SWEEP_MAX_N, SWEEP_METHOD_MAX_N.get(methodName, SWEEP_MAX_N))
+            self.appendOutput(f"【{methodName}】文档复杂度: {documentedComplexity(methodFunc)}")
+            self.appendOutput(f"  {'n':>10}  {'中位耗时(毫秒)':>16}")
             
-            # 扩大测试范围
-            for n in range(maxN + 1, maxN + 100):
-                formulaResult = fibonacciFormula(n)
-                iterativeResult = fibonacciIterativeImproved(n)
-                
-                if formulaResult != iterativeResult:
-                    errorN = n
-                    self.appendOutput(f"✗ 发现误差！")
-                    self.appendOutput(f"n = {n}")
-                    self.appendOutput(f"公式法结果: {formulaResult}")
-                    self.appendOutput(f"迭代法结果: {iterativeResult}")
-                    self.appendOutput(f"误差: {abs(formulaResult - iterativeResult)}")
-                    break
+            samples, stopReason = scalingSweep(
+                methodFunc, geometricRange(SWEEP_START_N, maxN),
+                onPoint=lambda n, t: self.appendOutput(f"  {n:>10}  {t * 1000:>16.6f}"))
+            if stopReason:
+                self.appendOutput(f"  停止: {stopReason}")
+            
+            # 太快的点受计时噪声影响，只用耗时不少于1微秒的点；
+            # 小n时常数开销占主导，渐近指数只用后半段的点拟合
+            fitSamples = [sample for sample in samples if sample[1] >= 1e-6]
+            fitSamples = fitSamples[len(fitSamples) // 2:] if len(fitSamples) >= 4 else fitSamples
+            if len(fitSamples) >= 2:
+                local = localExponents(samples)
+                tail = ", ".join(f"n={n}: {k:.2f}" for n, k in local[-3:])
+                if methodName == "递归法":
+                    _, rate = fitGrowthModel(fitSamples, "exponential")
+                    self.appendOutput(f"  指数模型拟合: 每增加1耗时 ×{math.exp(rate):.4f}（φ ≈ 1.6180）")
+                    summary.append((methodName, f"×{math.exp(rate):.4f}/n", samples[-1][0]))
+                else:
+                    _, exponent = fitGrowthModel(fitSamples, "power")
+                    self.appendOutput(f"  渐近拟合（后半段）: t ∝ n^{exponent:.3f}；末段局部指数: {tail}")
+                    summary.append((methodName, f"n^{exponent:.3f}", samples[-1][0]))
+            self.appendOutput("")
+        
+        self.appendOutput("【汇总】")
+        self.appendOutput(f"  {'方法':<12}{'拟合增长':>12}{'扫描到的最大n':>16}")
+        for methodName, growth, lastN in summary:
+            self.appendOutput(f"  {methodName:<12}{growth:>12}{lastN:>16}")
+        self.appendOutput("")
+
+    def computeModular(self):
+        """功能9: 计算 F(n) mod m（Pisano周期缩减 + 迭代/矩阵/倍增）"""
+        try:
+            n = int(self.nEntry.get())
+            m = int(self.modEntry.get())
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的n值和模数m")
+            return
+        if n < 0 or m < 1:
+            messagebox.showerror("错误", "n必须为非负整数，模数m必须为正整数")
+            return
+        self.runInBackground("功能9", self.computeModularTask, n, m)
+    
+    def computeModularTask(self, n, m):
+        """功能9后台任务"""
+        self.appendOutput(f"\n{'='*60}")
+        self.appendOutput(f"功能9: 计算 F({n}) mod {m}")
+        self.appendOutput(f"{'='*60}\n")
         
-        if errorN:
-            self.appendOutput(f"\n最小误差n值: {errorN}")
+        reducedN = n
+        if m <= PISANO_MAX_MODULUS:
+            cached = m in pisanoCache
+            startTime = time.perf_counter()
+            period = pisanoPeriod(m)
+            elapsedTime = (time.perf_counter() - startTime) * 1000
+            reducedN = n % period
+            self.appendOutput(f"Pisano周期 π({m}) = {period}"
+                              f"（{'缓存命中' if cached else '新计算'}，耗时: {elapsedTime:.6f} 毫秒）")
+            self.appendOutput(f"n mod π(m) = {reducedN}\n")
         else:
-            self.appendOutput(f"\n在测试范围内未发现误差（可能是浮点精度问题在更大n值才出现）")
+            self.appendOutput(f"模数超过 {PISANO_MAX_MODULUS}，不求周期，直接按原n计算\n")
         
+        methods = [("快速倍增法", "doubling"), ("矩阵法", "matrix"), ("迭代改进法", "iterative")]
+        results = []
+        for methodName, method in methods:
+            if method == "iterative" and reducedN > ITERATIVE_MOD_MAX_N:
+                self.appendOutput(f"{methodName}: 跳过（缩减后的n={reducedN}仍太大）")
+                continue
+            stats = benchmark(lambda k: fibonacciMod(k, m, method), n)
+            results.append(stats["result"])
+            self.appendOutput(f"{methodName}: F({n}) mod {m} = {stats['result']}, "
+                              f"中位耗时: {stats['medianNs'] / 1000:.3f} 微秒")
+        
+        if len(set(results)) == 1:
+            self.appendOutput(f"\n✓ 所有方法结果一致: {results[0]}")
+        else:
+            self.appendOutput("\n⚠ 警告: 不同方法的结果不一致！")
         self.appendOutput("")
 
 
@@ -1,10 +1,18 @@
 """
 检索算法实验程序
-包含核心算法：顺序查找、二分查找、三分查找
+包含核心算法：顺序查找、二分查找、三分查找、插值查找、指数查找
+第k小元素：蛮力法、预排序法、内省选择法（支持一次查询多个k）
 """
 
 import random
 import time
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:  # 未安装NumPy时，批量检索退回纯Python实现
+    np = None
 from tkinter import *
 from tkinter import scrolledtext, messagebox
 
@@ -30,9 +38,14 @@ def binarySearch(arr, target):
     时间复杂度：O(log n)
     返回：(位置索引, 比较次数, 最接近的元素信息)
     """
-    comparisons = 0
-    left = 0
-    right = len(arr) - 1
+    return binarySearchRange(arr, target, 0, len(arr) - 1)
+
+
+def binarySearchRange(arr, target, left, right, comparisons=0):
+    """
+    在 arr[left..right] 内二分查找，comparisons为之前已进行的比较次数
+    返回：(位置索引, 比较次数, 最接近的元素信息)
+    """
     closestIdx = -1
     closestDiff = float('inf')
     
@@ -126,6 +139,125 @@ def ternarySearch(arr, target):
     return -1, comparisons, closestInfo
 
 
+def closestInfoOf(arr, target, closestIdx, candidates):
+    """在已记录的最接近位置和候选位置中取差值最小者，返回 (值, 位置) 或 None"""
+    closestDiff = abs(arr[closestIdx] - target) if closestIdx != -1 else float('inf')
+    for i in candidates:
+        if 0 <= i < len(arr) and abs(arr[i] - target) < closestDiff:
+            closestDiff = abs(arr[i] - target)
+            closestIdx = i
+    return (arr[closestIdx], closestIdx) if closestIdx != -1 else None
+
+
+def interpolationSearch(arr, target):
+    """
+    插值查找算法（要求数组已排序）：按目标值在区间两端值之间的比例估计探查位置
+    时间复杂度：均匀分布时平均O(log log n)，最坏O(n)
+    返回：(位置索引, 比较次数, 最接近的元素信息)
+    """
+    comparisons = 0
+    left = 0
+    right = len(arr) - 1
+    closestIdx = -1
+    closestDiff = float('inf')
+    
+    while left <= right:
+        comparisons += 2
+        if target < arr[left] or target > arr[right]:
+            break
+        
+        if arr[right] == arr[left]:
+            pos = left
+        else:
+            pos = left + (target - arr[left]) * (right - left) // (arr[right] - arr[left])
+        
+        comparisons += 1
+        if arr[pos] == target:
+            return pos, comparisons, (arr[pos], pos)
+        
+        diff = abs(arr[pos] - target)
+        if diff < closestDiff:
+            closestDiff = diff
+            closestIdx = pos
+        
+        comparisons += 1
+        if arr[pos] < target:
+            left = pos + 1
+        else:
+            right = pos - 1
+    
+    return -1, comparisons, closestInfoOf(arr, target, closestIdx, (left, right))
+
+
+def exponentialSearch(arr, target):
+    """
+    指数查找（倍增查找）算法（要求数组已排序）：按1, 2, 4, ...倍增确定区间，再在区间内二分
+    目标靠近数组前端时很快
+    时间复杂度：O(log i)，i为目标所在位置
+    返回：(位置索引, 比较次数, 最接近的元素信息)
+    """
+    n = len(arr)
+    if n == 0:
+        return -1, 0, None
+    
+    comparisons = 1
+    if arr[0] == target:
+        return 0, comparisons, (arr[0], 0)
+    
+    bound = 1
+    while bound < n:
+        comparisons += 1
+        if arr[bound] >= target:
+            break
+        bound *= 2
+    
+    return binarySearchRange(arr, target, bound // 2, min(bound, n - 1), comparisons)
+
+
+def hybridSearch(arr, target):
+    """
+    插值-二分混合查找（要求数组已排序）
+    默认按插值探查；某一步插值没能把区间缩小一半（数据分布偏斜）时，下一步改用二分
+    时间复杂度：均匀分布时平均O(log log n)，最坏O(log n)
+    返回：(位置索引, 比较次数, 最接近的元素信息)
+    """
+    comparisons = 0
+    left = 0
+    right = len(arr) - 1
+    closestIdx = -1
+    closestDiff = float('inf')
+    useInterpolation = True
+    
+    while left <= right:
+        comparisons += 2
+        if target < arr[left] or target > arr[right]:
+            break
+        
+        size = right - left + 1
+        if useInterpolation and arr[right] != arr[left]:
+            pos = left + (target - arr[left]) * (right - left) // (arr[right] - arr[left])
+        else:
+            pos = (left + right) // 2
+        
+        comparisons += 1
+        if arr[pos] == target:
+            return pos, comparisons, (arr[pos], pos)
+        
+        diff = abs(arr[pos] - target)
+        if diff < closestDiff:
+            closestDiff = diff
+            closestIdx = pos
+        
+        comparisons += 1
+        if arr[pos] < target:
+            left = pos + 1
+        else:
+            right = pos - 1
+        useInterpolation = (right - left + 1) * 2 <= size
+    
+    return -1, comparisons, closestInfoOf(arr, target, closestIdx, (left, right))
+
+
 def ternarySearchPeak(arr, findMax=True):
     """
     三分查找找峰值（最大值或最小值）
@@ -199,6 +331,237 @@ def binarySearchPeak(arr, findMax=True):
     return left, arr[left], comparisons
 
 
+SORTED_SEARCH_METHODS = [
+    ("二分查找", binarySearch),
+    ("三分查找", ternarySearch),
+    ("插值查找", interpolationSearch),
+    ("指数查找", exponentialSearch),
+    ("插值-二分混合查找", hybridSearch)
+]
+
+
+# ==================== 批量检索 ====================
+
+BATCH_RANDOM_QUERIES = 100000  # 批量检索未输入目标时随机生成的查询个数
+BATCH_LOOP_QUERIES = 10000     # 与逐个调用binarySearch对比时最多逐个查询的个数
+
+
+def batchSearch(arr, targets):
+    """
+    批量二分检索（要求arr已升序）：一次回答多个目标
+    有NumPy时用 searchsorted 向量化；否则目标有序且足够多时用归并式扫描，其余逐个bisect
+    返回：(位置数组, 比较次数数组, 最接近值数组, 最接近位置数组)
+          未找到的位置为-1；最接近的元素取差值最小者，相同时取较小值；arr为空时最接近位置为-1
+    比较次数：二分为每个目标 n.bit_length() 次探查，归并扫描为实际比较次数
+    """
+    n = len(arr)
+    m = len(targets)
+    if np is not None:
+        return batchSearchNumpy(arr, targets)
+    
+    positions = array('q', [-1]) * m
+    comparisons = array('q', [0]) * m
+    nearestValues = array('q', [0]) * m
+    nearestPositions = array('q', [-1]) * m
+    if n == 0:
+        return positions, comparisons, nearestValues, nearestPositions
+    
+    targetsSorted = all(targets[i] <= targets[i + 1] for i in range(m - 1))
+    if targetsSorted and m * n.bit_length() >= n:
+        # 归并式扫描：目标和数组都有序，指针只前进不后退，共 O(n + m)
+        i = 0
+        for j in range(m):
+            target = targets[j]
+            count = 0
+            while i < n and arr[i] < target:
+                i += 1
+                count += 1
+            comparisons[j] = count + 1
+            fillBatchResult(arr, target, i, j, positions, nearestValues, nearestPositions)
+    else:
+        probes = n.bit_length()
+        for j in range(m):
+            target = targets[j]
+            comparisons[j] = probes
+            fillBatchResult(arr, target, bisect_left(arr, target), j, positions, nearestValues, nearestPositions)
+    return positions, comparisons, nearestValues, nearestPositions
+
+
+def fillBatchResult(arr, target, i, j, positions, nearestValues, nearestPositions):
+    """由插入点i（第一个不小于target的位置）填写第j个目标的结果"""
+    n = len(arr)
+    if i < n and arr[i] == target:
+        positions[j] = i
+        nearestValues[j] = target
+        nearestPositions[j] = i
+        return
+    # 插入点两侧的元素中取差值较小者，相同时取左侧（较小值）
+    if i == n or (i > 0 and target - arr[i - 1] <= arr[i] - target):
+        i -= 1
+    nearestValues[j] = arr[i]
+    nearestPositions[j] = i
+
+
+def batchSearchNumpy(arr, targets):
+    """batchSearch 的NumPy向量化实现，返回值相同（均为int64数组）"""
+    values = np.asarray(arr, dtype=np.int64)
+    queries = np.asarray(targets, dtype=np.int64)
+    n = len(values)
+    m = len(queries)
+    comparisons = np.full(m, n.bit_length(), dtype=np.int64)
+    if n == 0:
+        return (np.full(m, -1, dtype=np.int64), comparisons,
+                np.zeros(m, dtype=np.int64), np.full(m, -1, dtype=np.int64))
+    
+    # 目标有序时searchsorted可沿用上一个结果，访存连续得多；无序的目标先排序再放回原顺序
+    if m > 1 and not np.all(queries[:-1] <= queries[1:]):
+        order = np.argsort(queries, kind='stable')
+        right = np.empty(m, dtype=np.int64)
+        right[order] = np.searchsorted(values, queries[order], side='left')
+    else:
+        right = np.searchsorted(values, queries, side='left')
+    left = np.maximum(right - 1, 0)
+    rightClipped = np.minimum(right, n - 1)
+    found = (right < n) & (values[rightClipped] == queries)
+    
+    # 插入点两侧的元素中取差值较小者，相同时取左侧（较小值）
+    useLeft = (right == n) | ((right > 0) & (queries - values[left] <= values[rightClipped] - queries))
+    nearestPositions = np.where(found, rightClipped, np.where(useLeft, left, rightClipped))
+    positions = np.where(found, rightClipped, -1)
+    return positions, comparisons, values[nearestPositions], nearestPositions
+
+
+# ==================== 缓存友好布局 ====================
+
+LAYOUT_BENCH_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]  # 布局对比的数组长度
+LAYOUT_BENCH_QUERIES = 20000                             # 每个长度的查询个数
+
+
+class EytzingerIndex:
+    """
+    Eytzinger（BFS层序）布局的有序检索索引：结点k的左右孩子为2k、2k+1（下标从1开始）
+    查找路径的前几层集中在数组开头，常驻缓存；大数组上二分几乎每次探查都缺失缓存，
+    这里只有最后几层才会缺失。循环体只有一次比较和一次移位，没有分支判断相等
+    数据存放在 array('q') 中，有NumPy时直接在同一块缓冲区上向量化批量查找
+    """
+    
+    def __init__(self, sortedArr):
+        n = len(sortedArr)
+        self.values = sortedArr
+        self.tree = array('q', [0]) * (n + 1)  # 层序存放的值，tree[0]不用
+        self.rank = array('q', [0]) * (n + 1)  # 结点 -> 在有序数组中的位置
+        
+        # 对隐式完全二叉树做中序遍历，依次填入有序值
+        i = 0
+        k = 1
+        stack = []
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            self.tree[k] = sortedArr[i]
+            self.rank[k] = i
+            i += 1
+            k = 2 * k + 1
+        
+        self.treeArray = None
+        self.rankArray = None
+        if np is not None:
+            self.treeArray = np.frombuffer(self.tree, dtype=np.int64)
+            self.rankArray = np.frombuffer(self.rank, dtype=np.int64)
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def lowerBound(self, target):
+        """
+        第一个不小于target的元素在有序数组中的位置（不存在时为n）
+        返回：(位置, 比较次数)
+        """
+        tree = self.tree
+        n = len(tree) - 1
+        k = 1
+        comparisons = 0
+        while k <= n:
+            k = 2 * k + (tree[k] < target)
+            comparisons += 1
+        # 去掉末尾连续的1（最后几次向右走）以及其上一位，回到最后一次向左走的结点
+        k >>= ((~k) & (k + 1)).bit_length()
+        return (self.rank[k] if k else n), comparisons
+    
+    def search(self, target):
+        """
+        查找target，接口同 binarySearch（位置为有序数组中的位置）
+        返回：(位置索引, 比较次数, 最接近的元素信息)
+        """
+        pos, comparisons = self.lowerBound(target)
+        comparisons += 1
+        if pos < len(self.values) and self.values[pos] == target:
+            return pos, comparisons, (target, pos)
+        return -1, comparisons, closestInfoOf(self.values, target, -1, (pos - 1, pos))
+    
+    def batchLowerBound(self, targets):
+        """向量化的 lowerBound（需要NumPy），返回各目标的插入位置数组"""
+        queries = np.asarray(targets, dtype=np.int64)
+        n = len(self.tree) - 1
+        k = np.ones(len(queries), dtype=np.int64)
+        for _ in range(n.bit_length()):
+            active = k <= n
+            k[active] = 2 * k[active] + (self.treeArray[k[active]] < queries[active])
+        lowestZero = (~k) & (k + 1)
+        k >>= np.log2(lowestZero).astype(np.int64) + 1
+        return np.where(k > 0, self.rankArray[k], n)
+
+
+def benchmarkSearchLayouts(sizes=LAYOUT_BENCH_SIZES, queryCount=LAYOUT_BENCH_QUERIES):
+    """
+    在不同长度的有序数组上比较经典二分查找和Eytzinger布局查找的吞吐量
+    有NumPy时再比较两者的向量化批量版本（searchsorted 与 batchLowerBound）
+    返回：每个长度一条记录，耗时为每个查询的微秒数
+    """
+    results = []
+    for n in sizes:
+        arr = sorted(random.sample(range(2 * n), n))
+        targets = [random.randrange(2 * n) for _ in range(queryCount)]
+        
+        startTime = time.perf_counter()
+        index = EytzingerIndex(arr)
+        buildTime = time.perf_counter() - startTime
+        
+        startTime = time.perf_counter()
+        for target in targets:
+            binarySearch(arr, target)
+        binaryTime = time.perf_counter() - startTime
+        
+        startTime = time.perf_counter()
+        for target in targets:
+            index.search(target)
+        eytzingerTime = time.perf_counter() - startTime
+        
+        record = {
+            'n': n,
+            'buildMs': buildTime * 1000,
+            'binaryUs': binaryTime / queryCount * 1e6,
+            'eytzingerUs': eytzingerTime / queryCount * 1e6,
+            'searchsortedUs': None,
+            'batchEytzingerUs': None
+        }
+        
+        if np is not None:
+            values = np.asarray(arr, dtype=np.int64)
+            queries = np.asarray(targets, dtype=np.int64)
+            startTime = time.perf_counter()
+            np.searchsorted(values, queries)
+            record['searchsortedUs'] = (time.perf_counter() - startTime) / queryCount * 1e6
+            startTime = time.perf_counter()
+            index.batchLowerBound(queries)
+            record['batchEytzingerUs'] = (time.perf_counter() - startTime) / queryCount * 1e6
+        
+        results.append(record)
+    return results
+
+
 # ==================== 辅助算法 ====================
 
 def checkArrayOrder(arr):
@@ -293,6 +656,131 @@ def findKthSmallestPreSort(arr, k):
     return kthValue, originalIdx, comparisons
 
 
+INTROSELECT_SMALL = 16  # 区间不超过此长度时直接插入排序
+INTROSELECT_MAX_BAD = 2  # 连续这么多次划分都没把区间缩到3/4以下时，改用中位数的中位数
+
+
+def insertionSortRange(arr, idx, lo, hi):
+    """按 arr 的值对下标数组 idx[lo..hi] 插入排序，返回比较次数"""
+    comparisons = 0
+    for i in range(lo + 1, hi + 1):
+        current = idx[i]
+        j = i - 1
+        while j >= lo:
+            comparisons += 1
+            if arr[idx[j]] <= arr[current]:
+                break
+            idx[j + 1] = idx[j]
+            j -= 1
+        idx[j + 1] = current
+    return comparisons
+
+
+def partition3(arr, idx, lo, hi, pivot):
+    """
+    三路划分 idx[lo..hi]：小于pivot、等于pivot、大于pivot
+    返回：(lt, gt, 比较次数)，划分后 idx[lt..gt] 的值都等于pivot
+    """
+    comparisons = 0
+    lt, i, gt = lo, lo, hi
+    while i <= gt:
+        value = arr[idx[i]]
+        comparisons += 1
+        if value < pivot:
+            idx[lt], idx[i] = idx[i], idx[lt]
+            lt += 1
+            i += 1
+        else:
+            comparisons += 1
+            if value > pivot:
+                idx[i], idx[gt] = idx[gt], idx[i]
+                gt -= 1
+            else:
+                i += 1
+    return lt, gt, comparisons
+
+
+def medianOfMedians(arr, idx, lo, hi):
+    """
+    中位数的中位数：每5个一组取中位数，再递归选出这些中位数的中位数作为枢轴
+    保证划分后较大的一侧不超过约7/10
+    返回：(枢轴值, 比较次数)
+    """
+    comparisons = 0
+    medians = []
+    for start in range(lo, hi + 1, 5):
+        end = min(start + 4, hi)
+        comparisons += insertionSortRange(arr, idx, start, end)
+        medians.append(idx[(start + end) // 2])
+    mid = len(medians) // 2
+    comparisons += selectOrderStatistics(arr, medians, [mid], forceMedianOfMedians=True)
+    return arr[medians[mid]], comparisons
+
+
+def selectOrderStatistics(arr, idx, ranks, forceMedianOfMedians=False):
+    """
+    内省选择（introselect）：重排下标数组idx，使每个 r in ranks 满足 idx[r] 为第r小（从0开始）元素的下标
+    默认随机选枢轴（期望O(n)）；区间连续 INTROSELECT_MAX_BAD 次划分都没缩到原来的3/4以下时，
+    改用中位数的中位数选枢轴，每缩小到3/4最多花常数次划分，保证最坏O(n)
+    多个r在同一次划分后按所在一侧分组继续，共享前面的划分
+    返回：比较次数
+    """
+    comparisons = 0
+    stack = [(0, len(idx) - 1, sorted(set(ranks)), 0)]  # (lo, hi, ks, 连续不均匀划分次数)
+    while stack:
+        lo, hi, ks, bad = stack.pop()
+        if not ks:
+            continue
+        if hi - lo < INTROSELECT_SMALL:
+            comparisons += insertionSortRange(arr, idx, lo, hi)
+            continue
+        
+        if forceMedianOfMedians or bad >= INTROSELECT_MAX_BAD:
+            pivot, pivotComparisons = medianOfMedians(arr, idx, lo, hi)
+            comparisons += pivotComparisons
+        else:
+            pivot = arr[idx[random.randint(lo, hi)]]
+        lt, gt, partitionComparisons = partition3(arr, idx, lo, hi, pivot)
+        comparisons += partitionComparisons
+        
+        # 子区间超过原区间的3/4视为不均匀划分，连续计数；缩到3/4以下时清零
+        size = hi - lo + 1
+        for childLo, childHi, childKs in ((lo, lt - 1, [k for k in ks if k < lt]),
+                                          (gt + 1, hi, [k for k in ks if k > gt])):
+            childBad = bad + 1 if (childHi - childLo + 1) * 4 > size * 3 else 0
+            stack.append((childLo, childHi, childKs, childBad))
+    return comparisons
+
+
+def findKthSmallestSelect(arr, k):
+    """
+    内省选择法找第k个最小元素（随机快速选择 + 中位数的中位数兜底）
+    时间复杂度：期望O(n)，最坏O(n)
+    返回：(元素值, 位置索引, 比较次数)
+    """
+    if k < 1 or k > len(arr):
+        return None, -1, 0
+    
+    idx = list(range(len(arr)))
+    comparisons = selectOrderStatistics(arr, idx, [k - 1])
+    return arr[idx[k - 1]], idx[k - 1], comparisons
+
+
+def findKthSmallestMulti(arr, ks):
+    """
+    一次找出多个顺序统计量（如多个百分位数），各k共享划分过程
+    时间复杂度：O(n log m)，m为不同k的个数
+    返回：([(元素值, 位置索引), ...]（与ks顺序对应）, 比较次数)
+    """
+    for k in ks:
+        if k < 1 or k > len(arr):
+            raise ValueError(f"k值必须在1到{len(arr)}之间")
+    
+    idx = list(range(len(arr)))
+    comparisons = selectOrderStatistics(arr, idx, [k - 1 for k in ks])
+    return [(arr[idx[k - 1]], idx[k - 1]) for k in ks], comparisons
+
+
 def quickSort(arr):
     """
     快速排序算法
@@ -330,6 +818,76 @@ def quickSort(arr):
     return arrCopy, comparisons
 
 
+# ==================== 检索索引 ====================
+
+class SearchIndex:
+    """
+    有序检索索引：升序排列的值 + 每个排序位置在原数组中的下标（argsort）
+    每个数组只建立一次，之后的二分、三分查找为O(log n)，映射回原位置为O(1)
+    """
+    
+    def __init__(self, arr):
+        n = len(arr)
+        self.orderType = checkArrayOrder(arr)
+        self.sortComparisons = 0
+        
+        if self.orderType == 1:
+            self.values = list(arr)
+            self.order = list(range(n))
+        elif self.orderType == 2:
+            # 降序数组反转即为升序
+            self.values = arr[::-1]
+            self.order = list(range(n - 1, -1, -1))
+        else:
+            self.values, self.sortComparisons = quickSort(arr)
+            # 值 -> 原数组下标（有重复值时按出现顺序依次分配）
+            positions = {}
+            for i in range(n - 1, -1, -1):
+                positions.setdefault(arr[i], []).append(i)
+            self.order = [positions[value].pop() for value in self.values]
+        
+        # 批量检索用的NumPy副本，只转换一次
+        self.valuesArray = None
+        self.orderArray = None
+        if np is not None:
+            self.valuesArray = np.asarray(self.values, dtype=np.int64)
+            self.orderArray = np.asarray(self.order, dtype=np.int64)
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def originalIndex(self, pos):
+        """排序位置 -> 原数组下标，-1保持为-1"""
+        return self.order[pos] if pos != -1 else -1
+    
+    def search(self, searchFunc, target):
+        """
+        在排序后的值上调用 searchFunc(values, target)，并把结果映射回原数组
+        返回：(原数组中的位置索引, 比较次数, (最接近的值, 原数组中的位置) 或 None)
+        """
+        pos, comparisons, closest = searchFunc(self.values, target)
+        if closest:
+            closest = (closest[0], self.order[closest[1]])
+        return self.originalIndex(pos), comparisons, closest
+    
+    def batchSearch(self, targets):
+        """批量检索，结果同 batchSearch，位置均映射回原数组"""
+        if self.valuesArray is not None and np is not None:
+            positions, comparisons, nearestValues, nearestPositions = batchSearch(self.valuesArray, targets)
+            order = self.orderArray
+            positions = np.where(positions >= 0, order[positions], -1)
+            nearestPositions = np.where(nearestPositions >= 0, order[nearestPositions], -1)
+        else:
+            positions, comparisons, nearestValues, nearestPositions = batchSearch(self.values, targets)
+            order = self.order
+            for j in range(len(positions)):
+                if positions[j] >= 0:
+                    positions[j] = order[positions[j]]
+                if nearestPositions[j] >= 0:
+                    nearestPositions[j] = order[nearestPositions[j]]
+        return positions, comparisons, nearestValues, nearestPositions
+
+
 # ==================== GUI部分 ====================
 
 class SearchGUI:
@@ -339,6 +897,7 @@ class SearchGUI:
         self.root.geometry("900x750")
         
         self.currentArray = []
+        self.searchIndex = None  # 当前数组的检索索引，数组改变时失效
         
         # 数组生成区域
         arrayFrame = Frame(root)
@@ -381,8 +940,12 @@ class SearchGUI:
         
         Button(buttonFrame3, text="功能7: 查找第k小元素", command=self.findKthSmallest, 
                width=25, height=2, font=("Arial", 10)).pack(side=LEFT, padx=5)
+        Button(buttonFrame3, text="功能8: 批量检索", command=self.batchSearchFunc, 
+               width=25, height=2, font=("Arial", 10)).pack(side=LEFT, padx=5)
+        Button(buttonFrame3, text="功能9: 布局检索对比", command=self.compareLayouts, 
+               width=25, height=2, font=("Arial", 10)).pack(side=LEFT, padx=5)
         
-        # 输入框区域（用于功能4、5、7）
+        # 输入框区域（用于功能4、5、7、8）
         inputFrame = Frame(root)
         inputFrame.pack(pady=10)
         
@@ -417,6 +980,12 @@ class SearchGUI:
         self.outputText.see(END)
         self.root.update()
     
+    def setCurrentArray(self, arr):
+        """更换当前数组，并使检索索引失效"""
+        self.currentArray = arr
+        self.searchIndex = None
+        self.arrayLabel.config(text=str(self.currentArray[:20]) + ("..." if len(self.currentArray) > 20 else ""))
+    
     def generateRandomArray(self):
         """随机生成数组"""
         try:
@@ -429,9 +998,8 @@ class SearchGUI:
             
             # 生成0到n*2范围内的n个不重复随机数
             maxVal = n * 2
-            self.currentArray = random.sample(range(maxVal), n)
+            self.setCurrentArray(random.sample(range(maxVal), n))
             
-            self.arrayLabel.config(text=str(self.currentArray[:20]) + ("..." if len(self.currentArray) > 20 else ""))
             self.appendOutput(f"\n{'='*60}")
             self.appendOutput(f"随机生成数组（长度={n}）")
             self.appendOutput(f"数组: {self.currentArray}")
@@ -466,10 +1034,9 @@ class SearchGUI:
                     messagebox.showerror("错误", "数组元素必须互不相同")
                     return
                 
-                self.currentArray = elements
+                self.setCurrentArray(elements)
                 self.nEntry.delete(0, END)
                 self.nEntry.insert(0, str(len(elements)))
-                self.arrayLabel.config(text=str(self.currentArray[:20]) + ("..." if len(self.currentArray) > 20 else ""))
                 self.appendOutput(f"\n{'='*60}")
                 self.appendOutput(f"手动输入数组（长度={len(elements)}）")
                 self.appendOutput(f"数组: {self.currentArray}")
@@ -500,15 +1067,12 @@ class SearchGUI:
         endTime = time.time()
         elapsedTime = (endTime - startTime) * 1000  # 转换为毫秒
         
-        self.currentArray = sortedArray
+        self.setCurrentArray(sortedArray)
         
         self.appendOutput(f"排序后数组: {sortedArray}")
         self.appendOutput(f"关键字比较次数: {comparisons}")
         self.appendOutput(f"执行时间: {elapsedTime:.6f} 毫秒")
         self.appendOutput("")
-        
-        # 更新显示
-        self.arrayLabel.config(text=str(self.currentArray[:20]) + ("..." if len(self.currentArray) > 20 else ""))
     
     def checkOrder(self):
         """功能3: 判断数组排序状态"""
@@ -565,7 +1129,7 @@ class SearchGUI:
         self.appendOutput("")
     
     def multipleSearch(self):
-        """功能5: 多种方法检索（顺序、二分、三分）"""
+        """功能5: 多种方法检索（顺序、二分、三分、插值、指数、插值-二分混合）"""
         if not self.currentArray:
             messagebox.showwarning("警告", "请先生成或输入数组")
             return
@@ -576,33 +1140,32 @@ class SearchGUI:
             messagebox.showerror("错误", "请输入有效的查找元素")
             return
         
-        originalOrderType = checkArrayOrder(self.currentArray)
+        # 检索索引每个数组只建立一次，重复查询直接复用
+        indexCached = self.searchIndex is not None
+        if not indexCached:
+            self.searchIndex = SearchIndex(self.currentArray)
+        index = self.searchIndex
         orderNames = ["未排序", "升序", "降序", "先升后降", "先降后升"]
         
         self.appendOutput(f"\n{'='*60}")
-        self.appendOutput("功能5: 多种方法检索（顺序、二分、三分）")
+        self.appendOutput("功能5: 多种方法检索（顺序、二分、三分、插值、指数、混合）")
         self.appendOutput(f"{'='*60}\n")
         
         self.appendOutput(f"原数组: {self.currentArray}")
-        self.appendOutput(f"原数组状态: {orderNames[originalOrderType]}")
+        self.appendOutput(f"原数组状态: {orderNames[index.orderType]}")
         self.appendOutput(f"查找元素: {target}\n")
         
-        # 复制数组用于查找
-        searchArray = self.currentArray.copy()
+        # 不是升序或降序时，建立索引需要快速排序（只在第一次查询时进行）
         sortComparisons = 0
-        isSorted = False
-        
-        # 如果数组不是升序或降序，自动使用快排排序
-        if originalOrderType not in [1, 2]:
-            self.appendOutput(f"数组不是升序或降序，自动使用快速排序...")
-            sortedArray, sortComparisons = quickSort(searchArray)
-            searchArray = sortedArray
-            isSorted = True
-            self.appendOutput(f"排序完成，排序比较次数: {sortComparisons}")
-            self.appendOutput(f"排序后数组: {searchArray}\n")
-        elif originalOrderType == 2:
-            # 如果是降序，反转数组用于查找
-            searchArray = searchArray[::-1]
+        if index.orderType not in [1, 2]:
+            if indexCached:
+                self.appendOutput("复用已建立的检索索引，无需重新排序\n")
+            else:
+                sortComparisons = index.sortComparisons
+                self.appendOutput(f"数组不是升序或降序，自动使用快速排序建立检索索引...")
+                self.appendOutput(f"排序完成，排序比较次数: {sortComparisons}")
+                self.appendOutput(f"排序后数组: {index.values}\n")
+        elif index.orderType == 2:
             self.appendOutput("注意: 数组为降序，已反转用于查找\n")
         
         # 顺序查找（在原数组上查找，不需要排序）
@@ -615,82 +1178,104 @@ class SearchGUI:
             self.appendOutput(f"  未找到，位置索引: -1")
         self.appendOutput(f"  比较次数: {comp1}\n")
         
-        # 二分查找（在排序后的数组上查找）
-        pos2, comp2, closest2 = binarySearch(searchArray, target)
-        # 映射位置索引到原数组
-        if isSorted:
-            # 排序后的位置，需要找到在原数组中的位置
-            if pos2 != -1:
-                originalPos2 = self.currentArray.index(searchArray[pos2])
+        # 有序查找方法（在索引的有序值上查找，位置映射回原数组）
+        for methodName, searchFunc in SORTED_SEARCH_METHODS:
+            originalPos, comps, closest = index.search(searchFunc, target)
+            
+            self.appendOutput(f"【{methodName}】")
+            if originalPos != -1:
+                self.appendOutput(f"  找到！位置索引: {originalPos} (原数组中的位置)")
             else:
-                originalPos2 = -1
-            if closest2:
-                originalClosest2 = self.currentArray.index(closest2[0])
-                closest2 = (closest2[0], originalClosest2)
-        elif originalOrderType == 2:
-            # 原数组是降序，反转后的位置需要转换
-            if pos2 != -1:
-                originalPos2 = len(searchArray) - 1 - pos2
+                self.appendOutput(f"  未找到，位置索引: -1")
+                if closest:
+                    self.appendOutput(f"  最接近的元素: 值={closest[0]}, 位置={closest[1]} (原数组中的位置)")
+            self.appendOutput(f"  查找比较次数: {comps}")
+            if sortComparisons > 0:
+                self.appendOutput(f"  排序比较次数: {sortComparisons}")
+                self.appendOutput(f"  总比较次数: {comps + sortComparisons}\n")
             else:
-                originalPos2 = -1
-            if closest2:
-                originalClosest2 = len(searchArray) - 1 - closest2[1]
-                closest2 = (closest2[0], originalClosest2)
-        else:  # 原数组是升序
-            originalPos2 = pos2
-        
-        self.appendOutput("【二分查找】")
-        if originalPos2 != -1:
-            self.appendOutput(f"  找到！位置索引: {originalPos2} (原数组中的位置)")
-        else:
-            self.appendOutput(f"  未找到，位置索引: -1")
-            if closest2:
-                self.appendOutput(f"  最接近的元素: 值={closest2[0]}, 位置={closest2[1]} (原数组中的位置)")
-        self.appendOutput(f"  查找比较次数: {comp2}")
-        if sortComparisons > 0:
-            self.appendOutput(f"  排序比较次数: {sortComparisons}")
-            self.appendOutput(f"  总比较次数: {comp2 + sortComparisons}\n")
-        else:
-            self.appendOutput("")
+                self.appendOutput("")
         
-        # 三分查找（在排序后的数组上查找）
-        pos3, comp3, closest3 = ternarySearch(searchArray, target)
-        # 映射位置索引到原数组
-        if isSorted:
-            # 排序后的位置，需要找到在原数组中的位置
-            if pos3 != -1:
-                originalPos3 = self.currentArray.index(searchArray[pos3])
-            else:
-                originalPos3 = -1
-            if closest3:
-                originalClosest3 = self.currentArray.index(closest3[0])
-                closest3 = (closest3[0], originalClosest3)
-        elif originalOrderType == 2:
-            # 原数组是降序，反转后的位置需要转换
-            if pos3 != -1:
-                originalPos3 = len(searchArray) - 1 - pos3
+        self.appendOutput("")
+    
+    def batchSearchFunc(self):
+        """功能8: 批量检索（查找元素框中用逗号或空格分隔多个目标，为空时随机生成）"""
+        if not self.currentArray:
+            messagebox.showwarning("警告", "请先生成或输入数组")
+            return
+        
+        text = self.targetEntry.get().strip()
+        try:
+            if text:
+                targets = [int(x) for x in text.replace(',', ' ').split()]
             else:
-                originalPos3 = -1
-            if closest3:
-                originalClosest3 = len(searchArray) - 1 - closest3[1]
-                closest3 = (closest3[0], originalClosest3)
-        else:  # 原数组是升序
-            originalPos3 = pos3
-        
-        self.appendOutput("【三分查找】")
-        if originalPos3 != -1:
-            self.appendOutput(f"  找到！位置索引: {originalPos3} (原数组中的位置)")
-        else:
-            self.appendOutput(f"  未找到，位置索引: -1")
-            if closest3:
-                self.appendOutput(f"  最接近的元素: 值={closest3[0]}, 位置={closest3[1]} (原数组中的位置)")
-        self.appendOutput(f"  查找比较次数: {comp3}")
-        if sortComparisons > 0:
-            self.appendOutput(f"  排序比较次数: {sortComparisons}")
-            self.appendOutput(f"  总比较次数: {comp3 + sortComparisons}\n")
-        else:
-            self.appendOutput("")
+                maxVal = len(self.currentArray) * 2
+                targets = [random.randrange(-1, maxVal + 1) for _ in range(BATCH_RANDOM_QUERIES)]
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的查找元素（多个目标用逗号或空格分隔）")
+            return
         
+        self.appendOutput(f"\n{'='*60}")
+        self.appendOutput("功能8: 批量检索")
+        self.appendOutput(f"{'='*60}\n")
+        
+        if self.searchIndex is None:
+            self.searchIndex = SearchIndex(self.currentArray)
+        index = self.searchIndex
+        
+        startTime = time.perf_counter()
+        positions, comparisons, nearestValues, nearestPositions = index.batchSearch(targets)
+        batchTime = time.perf_counter() - startTime
+        
+        foundCount = sum(1 for pos in positions if pos >= 0)
+        self.appendOutput(f"数组长度: {len(index)}，查询个数: {len(targets)}"
+                          f"（{'输入' if text else '随机生成'}），实现: {'NumPy searchsorted' if np is not None else '纯Python'}")
+        self.appendOutput(f"找到: {foundCount} 个，未找到: {len(targets) - foundCount} 个")
+        self.appendOutput(f"总比较次数: {sum(int(c) for c in comparisons)}")
+        
+        # 逐个调用binarySearch作对比（最多 BATCH_LOOP_QUERIES 个，按单次耗时比较）
+        loopTargets = targets[:BATCH_LOOP_QUERIES]
+        startTime = time.perf_counter()
+        for target in loopTargets:
+            binarySearch(index.values, target)
+        loopTime = time.perf_counter() - startTime
+        batchPerQuery = batchTime / len(targets) * 1e6 if targets else 0.0
+        loopPerQuery = loopTime / len(loopTargets) * 1e6 if loopTargets else 0.0
+        self.appendOutput(f"批量检索: 总耗时 {batchTime * 1000:.3f} 毫秒，每个查询 {batchPerQuery:.4f} 微秒")
+        self.appendOutput(f"逐个binarySearch（{len(loopTargets)}个）: 每个查询 {loopPerQuery:.4f} 微秒")
+        if batchPerQuery > 0:
+            self.appendOutput(f"吞吐量提升: {loopPerQuery / batchPerQuery:.1f} 倍")
+        
+        self.appendOutput("\n前20个查询:")
+        for j in range(min(20, len(targets))):
+            if positions[j] >= 0:
+                self.appendOutput(f"  {targets[j]}: 位置 {int(positions[j])}，比较 {int(comparisons[j])} 次")
+            elif nearestPositions[j] >= 0:
+                self.appendOutput(f"  {targets[j]}: 未找到，最接近的元素 值={int(nearestValues[j])}, "
+                                  f"位置={int(nearestPositions[j])}，比较 {int(comparisons[j])} 次")
+            else:
+                self.appendOutput(f"  {targets[j]}: 未找到")
+        self.appendOutput("")
+    
+    def compareLayouts(self):
+        """功能9: 经典二分查找与Eytzinger布局查找在不同数组长度下的吞吐量对比"""
+        self.appendOutput(f"\n{'='*60}")
+        self.appendOutput("功能9: 布局检索对比（有序数组二分 vs Eytzinger层序布局）")
+        self.appendOutput(f"{'='*60}\n")
+        self.appendOutput(f"每个长度随机查询 {LAYOUT_BENCH_QUERIES} 次，耗时为每个查询的微秒数\n")
+        
+        header = f"  {'n':>9}{'建立(毫秒)':>12}{'二分':>10}{'Eytzinger':>11}"
+        if np is not None:
+            header += f"{'searchsorted':>14}{'批量Eytzinger':>15}"
+        self.appendOutput(header)
+        
+        for size in LAYOUT_BENCH_SIZES:
+            record = benchmarkSearchLayouts([size])[0]
+            line = (f"  {record['n']:>9}{record['buildMs']:>12.1f}"
+                    f"{record['binaryUs']:>10.3f}{record['eytzingerUs']:>11.3f}")
+            if np is not None:
+                line += f"{record['searchsortedUs']:>14.4f}{record['batchEytzingerUs']:>15.4f}"
+            self.appendOutput(line)
         self.appendOutput("")
     
     def findPeak(self):
@@ -737,18 +1322,27 @@ class SearchGUI:
             return
         
         try:
-            k = int(self.kEntry.get())
-            if k < 1 or k > len(self.currentArray):
-                messagebox.showerror("错误", f"k值必须在1到{len(self.currentArray)}之间")
-                return
+            ks = [int(x) for x in self.kEntry.get().replace(',', ' ').split()]
         except ValueError:
+            messagebox.showerror("错误", "请输入有效的k值（多个k用逗号或空格分隔）")
+            return
+        if not ks:
             messagebox.showerror("错误", "请输入有效的k值")
             return
+        for k in ks:
+            if k < 1 or k > len(self.currentArray):
+                messagebox.showerror("错误", f"k值必须在1到{len(self.currentArray)}之间")
+                return
         
         self.appendOutput(f"\n{'='*60}")
-        self.appendOutput("功能7: 查找第k个最小元素（蛮力法和预排序）")
+        self.appendOutput("功能7: 查找第k个最小元素（蛮力法、预排序、内省选择）")
         self.appendOutput(f"{'='*60}\n")
         
+        if len(ks) > 1:
+            self.findMultipleKthSmallest(ks)
+            return
+        k = ks[0]
+        
         self.appendOutput(f"数组: {self.currentArray}")
         self.appendOutput(f"k = {k}\n")
         
@@ -766,10 +1360,45 @@ class SearchGUI:
         self.appendOutput(f"  位置索引: {idx2}")
         self.appendOutput(f"  比较次数: {comp2}\n")
         
-        if val1 == val2:
-            self.appendOutput(f"✓ 两种方法结果一致: {val1}")
+        # 内省选择法
+        val3, idx3, comp3 = findKthSmallestSelect(self.currentArray, k)
+        self.appendOutput("【内省选择法（快速选择 + 中位数的中位数）】")
+        self.appendOutput(f"  第{k}个最小元素: {val3}")
+        self.appendOutput(f"  位置索引: {idx3}")
+        self.appendOutput(f"  比较次数: {comp3}\n")
+        
+        if val1 == val2 == val3:
+            self.appendOutput(f"✓ 三种方法结果一致: {val1}")
+        else:
+            self.appendOutput(f"⚠ 警告: 三种方法结果不一致！")
+        
+        self.appendOutput("")
+    
+    def findMultipleKthSmallest(self, ks):
+        """一次查询多个k（如百分位数），与逐个内省选择比较"""
+        n = len(self.currentArray)
+        if n <= 50:
+            self.appendOutput(f"数组: {self.currentArray}")
+        else:
+            self.appendOutput(f"数组规模: {n}")
+        self.appendOutput(f"k = {ks}\n")
+        
+        results, multiComparisons = findKthSmallestMulti(self.currentArray, ks)
+        self.appendOutput("【多k内省选择（共享划分）】")
+        self.appendOutput(f"{'k':<10}{'百分位':<10}{'元素值':<15}{'位置索引':<10}")
+        self.appendOutput("-" * 45)
+        for k, (value, idx) in zip(ks, results):
+            self.appendOutput(f"{k:<10}{k / n:<10.1%}{value:<15}{idx:<10}")
+        self.appendOutput(f"\n  比较次数: {multiComparisons}")
+        
+        singleComparisons = sum(findKthSmallestSelect(self.currentArray, k)[2] for k in ks)
+        self.appendOutput(f"  逐个k内省选择比较次数: {singleComparisons}")
+        
+        sortedArr = sorted(self.currentArray)
+        if all(value == sortedArr[k - 1] for k, (value, _) in zip(ks, results)):
+            self.appendOutput("✓ 结果与排序后数组一致")
         else:
-            self.appendOutput(f"⚠ 警告: 两种方法结果不一致！")
+            self.appendOutput("⚠ 警告: 结果与排序后数组不一致！")
         
         self.appendOutput("")
 
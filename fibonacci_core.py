@@ -0,0 +1,2003 @@
+"""
+斐波那契数列计算实验：核心算法与实验接口（不依赖图形界面）
+包含多种核心算法：迭代法、迭代改进、递归法、公式法、矩阵法、快速倍增法
+既可被 1-fibonacci_gui.py 导入，也可作为命令行程序运行：
+    python fibonacci_core.py compare 1000
+    python fibonacci_core.py --json find-max --bits 64
+"""
+
+import time
+import math
+import sys
+import os
+import threading
+import multiprocessing
+import statistics
+import tracemalloc
+import argparse
+import csv
+import json
+import mmap
+import struct
+from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from decimal import Decimal, localcontext, MAX_EMAX, MIN_EMIN, ROUND_FLOOR, ROUND_HALF_EVEN
+
+try:
+    import numpy as np
+except ImportError:  # 未安装NumPy时，批量接口退回标准库array和列表
+    np = None
+try:
+    import gmpy2
+except ImportError:  # 未安装gmpy2时，大整数运算使用Python内置int
+    gmpy2 = None
+
+# ==================== 大整数后端部分 ====================
+# 大整数很大时，耗时几乎全在乘法上：CPython的int最多用到Karatsuba，
+# gmpy2的mpz（GMP）会随位数切换到Toom-Cook和FFT乘法。
+# 各算法内部用 bigInt 构造初始值，运算全程停留在所选后端，只在返回时转回int
+
+INT_BACKENDS = {"int": int}
+if gmpy2 is not None:
+    INT_BACKENDS["gmpy2"] = gmpy2.mpz
+intBackend = "gmpy2" if gmpy2 is not None else "int"  # 当前后端名称
+bigInt = INT_BACKENDS[intBackend]                      # 当前后端的整数类型
+
+
+def setIntBackend(name):
+    """切换大整数后端（"int" 或 "gmpy2"），后端不可用时抛出ValueError"""
+    global intBackend, bigInt
+    if name not in INT_BACKENDS:
+        raise ValueError(f"大整数后端不可用: {name}（可用: {', '.join(INT_BACKENDS)}）")
+    intBackend = name
+    bigInt = INT_BACKENDS[name]
+
+
+# ==================== 核心算法部分 ====================
+
+def fibonacciIterative(n):
+    """
+    迭代法：使用数组存储所有斐波那契数
+    时间复杂度：O(n)次加法，计入大整数位数为 O(n^2)
+    空间复杂度：O(n)个数，共 O(n^2) 位
+    """
+    if n <= 0:
+        return 0
+    if n == 1:
+        return 1
+    
+    fibArray = [0] * (n + 1)
+    fibArray[0] = bigInt(0)
+    fibArray[1] = bigInt(1)
+    
+    for i in range(2, n + 1):
+        fibArray[i] = fibArray[i - 1] + fibArray[i - 2]
+    
+    return int(fibArray[n])
+
+
+FIB_WINDOW_SIZE = 16  # 滑动窗口法默认保留的最近项数
+
+
+def fibonacciWindow(n, size=FIB_WINDOW_SIZE):
+    """
+    滑动窗口迭代：只保留最近size项，供需要随机访问近期项的调用方使用
+    返回deque，window[i] = F(n - len(window) + 1 + i)，最后一项为F(n)
+    时间复杂度：O(n)次加法
+    空间复杂度：O(size)个数
+    """
+    window = deque([0], maxlen=max(size, 2))
+    prev, curr = bigInt(0), bigInt(1)
+    for i in range(1, n + 1):
+        window.append(curr)
+        prev, curr = curr, prev + curr
+    
+    if size < 2:
+        return deque([int(window[-1])], maxlen=1)
+    return deque((int(value) for value in window), maxlen=window.maxlen)
+
+
+def fibonacciIterativeWindow(n):
+    """
+    迭代法（滑动窗口）：数组法的低内存版本，只保留最近 FIB_WINDOW_SIZE 项而非全部n+1项
+    时间复杂度：O(n)次加法，计入大整数位数为 O(n^2)
+    空间复杂度：O(FIB_WINDOW_SIZE)个数，共 O(n) 位
+    """
+    return fibonacciWindow(n)[-1]
+
+
+def fibonacciIterativeImproved(n, mod=None):
+    """
+    迭代改进法：只保存最近的两个值，节省空间
+    mod不为None时计算 F(n) mod m，中间值始终小于m
+    时间复杂度：O(n)次加法，计入大整数位数为 O(n^2)
+    空间复杂度：O(1)个数，共 O(n) 位
+    """
+    if mod is not None:
+        prev, curr = 0, 1 % mod
+        for i in range(n):
+            prev, curr = curr, (prev + curr) % mod
+        return prev
+    
+    cached = tableLookup(n)
+    if cached is not None:
+        return cached
+    if n <= 0:
+        return 0
+    if n == 1:
+        return 1
+    
+    prev = bigInt(0)
+    curr = bigInt(1)
+    
+    for i in range(2, n + 1):
+        nextVal = prev + curr
+        prev = curr
+        curr = nextVal
+    
+    return int(curr)
+
+
+def fibonacciRecursive(n):
+    """
+    递归法：直接递归计算
+    时间复杂度：O(2^n)
+    空间复杂度：O(n)
+    """
+    if n <= 0:
+        return 0
+    if n == 1:
+        return 1
+    return fibonacciRecursive(n - 1) + fibonacciRecursive(n - 2)
+
+
+def fibonacciFormula(n):
+    """
+    公式法：使用Binet公式 F(n) = (φ^n - ψ^n) / sqrt(5)
+    其中 φ = (1 + sqrt(5)) / 2, ψ = (1 - sqrt(5)) / 2
+    时间复杂度：O(1)次浮点运算（仅 n ≤ 70 左右精确，n > 1474 时溢出）
+    空间复杂度：O(1)
+    """
+    if n <= 0:
+        return 0
+    
+    sqrt5 = math.sqrt(5)
+    phi = (1 + sqrt5) / 2
+    psi = (1 - sqrt5) / 2
+    
+    result = (phi ** n - psi ** n) / sqrt5
+    return int(round(result))
+
+
+LOG10_PHI = math.log10((1 + math.sqrt(5)) / 2)
+LOG10_2 = math.log10(2)
+FORMULA_GUARD_DIGITS = 10      # 高精度公式法在结果位数之外额外保留的保护位数
+DECIMAL_SPLIT_DIGITS = 2000    # decimal转int时，低于此位数直接转换
+
+
+def decimalDigits(value):
+    """
+    整数的十进制位数，不做完整的进制转换
+    （大整数转字符串的代价是平方级的，且超过4300位时会被解释器拒绝）
+    """
+    value = abs(value)
+    if value == 0:
+        return 1
+    digits = int((value.bit_length() - 1) * LOG10_2) + 1  # 2^(位长-1) 的位数
+    if value >= 10 ** digits:
+        digits += 1
+    return digits
+
+
+OUTPUT_MAX_DIGITS = 200   # 超过此位数的整数只显示首尾并注明位数
+OUTPUT_EDGE_DIGITS = 20   # 截断显示时首尾各保留的位数
+
+
+def formatNumber(value, maxDigits=OUTPUT_MAX_DIGITS, edgeDigits=OUTPUT_EDGE_DIGITS):
+    """
+    把整数格式化为便于显示的字符串，超过maxDigits位时只保留首尾各edgeDigits位
+    首尾数字分别由除以和模10的幂得到，不做完整的进制转换
+    """
+    if not isinstance(value, int) or isinstance(value, bool):
+        return str(value)
+    digits = decimalDigits(value)
+    if maxDigits is None or digits <= maxDigits:
+        return str(value)
+    
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    edge = min(edgeDigits, digits // 2)
+    leading = value // 10 ** (digits - edge)
+    trailing = value % 10 ** edge
+    return f"{sign}{leading}...{trailing:0{edge}d}（共{digits}位）"
+
+
+def formulaDecimalPrecision(n):
+    """高精度公式法的工作精度：F(n)的位数，加上φ^n放大误差所需的位数和保护位"""
+    return int(n * LOG10_PHI) + len(str(n)) + FORMULA_GUARD_DIGITS
+
+
+def invSqrt5Schedule(prec):
+    """
+    牛顿迭代各轮的目标精度：从30位起每轮翻倍直到prec，再在prec下多迭代一轮
+    每轮误差约为上一轮的平方乘以常数，翻倍后的最后一轮可能差几位，多出的一轮把它补足
+    """
+    schedule = []
+    currPrec = 30
+    while currPrec < prec:
+        currPrec = min(currPrec * 2, prec)
+        schedule.append(currPrec)
+    schedule.append(prec)
+    return schedule
+
+
+def decimalInvSqrt5(prec):
+    """
+    用牛顿迭代 y = y + y(1 - 5y^2)/2 计算 1/sqrt(5)，结果精确到prec位以上
+    每轮精度翻倍且不含除法，比在目标精度下直接开方快得多
+    """
+    with localcontext() as ctx:
+        ctx.prec = 30
+        y = 1 / Decimal(5).sqrt()
+        for currPrec in invSqrt5Schedule(prec):
+            ctx.prec = currPrec + FORMULA_GUARD_DIGITS
+            y = y + y * (1 - 5 * y * y) / 2
+    return y
+
+
+def decimalToInt(d, digits, pow10Cache=None):
+    """
+    分治地把整数值的Decimal转换为int：高半部分*10^k + 低半部分
+    直接int(d)的代价是位数的平方，分治后主要开销为大整数乘法
+    调用方需保证当前上下文精度不小于digits
+    """
+    if digits <= DECIMAL_SPLIT_DIGITS:
+        return int(d)
+    if pow10Cache is None:
+        pow10Cache = {}
+    
+    k = digits // 2
+    high = d.scaleb(-k).to_integral_value(rounding=ROUND_FLOOR)
+    low = d - high.scaleb(k)
+    if k not in pow10Cache:
+        pow10Cache[k] = 10 ** k
+    return (decimalToInt(high, digits - k, pow10Cache) * pow10Cache[k]
+            + decimalToInt(low, k, pow10Cache))
+
+
+def fibonacciFormulaDecimal(n):
+    """
+    公式法（高精度）：用decimal计算Binet公式 F(n) = round(φ^n / sqrt(5))
+    |ψ^n / sqrt(5)| < 0.5 恒成立，舍入即可消去ψ项
+    F(n)约有 n*log10(φ) 位，工作精度按n自动选取，因此任意n都精确
+    时间复杂度：O(log n)次高精度乘法，计入位数为 O(M(n) log n)，M(n)为n位乘法的代价
+    空间复杂度：O(n)
+    """
+    if n <= 0:
+        return 0
+    
+    prec = formulaDecimalPrecision(n)
+    invSqrt5 = decimalInvSqrt5(prec)
+    
+    with localcontext() as ctx:
+        ctx.prec = prec
+        ctx.Emax = MAX_EMAX
+        ctx.Emin = MIN_EMIN
+        
+        phi = (1 + 5 * invSqrt5) / 2
+        result = (phi ** n * invSqrt5).to_integral_value(rounding=ROUND_HALF_EVEN)
+        return decimalToInt(result, len(result.as_tuple().digits))
+
+
+def fibonacciMatrix(n, mod=None):
+    """
+    矩阵法：使用矩阵快速幂
+    mod不为None时每次乘法后取模，计算 F(n) mod m
+    时间复杂度：O(log n)次乘法，计入大整数乘法为 O(M(n))（Karatsuba下 M(n) ≈ n^1.585）
+    空间复杂度：O(1)个数，共 O(n) 位
+    """
+    if mod is None:
+        cached = tableLookup(n)
+        if cached is not None:
+            return cached
+    if n <= 0:
+        return 0
+    if n == 1:
+        return 1 if mod is None else 1 % mod
+    
+    # 迭代快速幂，矩阵元素直接用局部变量保存，避免每步创建嵌套列表
+    # 结果矩阵 [[r00, r01], [r10, r11]]，初始为单位矩阵
+    one, zero = (1, 0) if mod is not None else (bigInt(1), bigInt(0))
+    r00, r01, r10, r11 = one, zero, zero, one
+    # 底数矩阵 [[1, 1], [1, 0]]
+    b00, b01, b10, b11 = one, one, one, zero
+    power = n
+    
+    while power > 0:
+        if power & 1:
+            r00, r01, r10, r11 = (r00 * b00 + r01 * b10, r00 * b01 + r01 * b11,
+                                  r10 * b00 + r11 * b10, r10 * b01 + r11 * b11)
+            if mod is not None:
+                r00, r01, r10, r11 = r00 % mod, r01 % mod, r10 % mod, r11 % mod
+        power >>= 1
+        if power:
+            b00, b01, b10, b11 = (b00 * b00 + b01 * b10, b00 * b01 + b01 * b11,
+                                  b10 * b00 + b11 * b10, b10 * b01 + b11 * b11)
+            if mod is not None:
+                b00, b01, b10, b11 = b00 % mod, b01 % mod, b10 % mod, b11 % mod
+    
+    return int(r01) if mod is None else r01 % mod
+
+
+def fibonacciPair(n, mod=None):
+    """
+    快速倍增核心：返回 (F(n), F(n+1))
+    利用 F(2k) = F(k) * (2F(k+1) - F(k))，F(2k+1) = F(k)^2 + F(k+1)^2
+    从n的最高位开始逐位迭代，不使用递归，也不分配列表
+    mod不为None时每步取模，返回 (F(n) mod m, F(n+1) mod m)
+    时间复杂度：O(log n)
+    空间复杂度：O(1)
+    """
+    if mod is not None:
+        a, b = 0, 1 % mod
+        for bit in range(n.bit_length() - 1, -1, -1):
+            c = a * ((b << 1) - a) % mod
+            d = (a * a + b * b) % mod
+            if (n >> bit) & 1:
+                a, b = d, (c + d) % mod
+            else:
+                a, b = c, d
+        return a, b
+    
+    if n <= 0:
+        return 0, 1
+    
+    a, b = bigInt(0), bigInt(1)  # F(0), F(1)
+    for bit in range(n.bit_length() - 1, -1, -1):
+        c = a * ((b << 1) - a)  # F(2k)
+        d = a * a + b * b       # F(2k+1)
+        if (n >> bit) & 1:
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    
+    return int(a), int(b)
+
+
+def findMaxFibonacciIndex(bound):
+    """
+    求满足 F(n) <= bound 的最大n，bound可以是任意大的整数
+    先由 F(n) ≈ φ^n / sqrt(5) 估计 n ≈ log_φ(bound * sqrt(5))，
+    再用快速倍增算出 F(n), F(n+1) 并向前/向后修正（通常不超过1步）
+    时间复杂度：O(log n)次大整数乘法
+    返回：(n, F(n))
+    """
+    if bound < 1:
+        return 0, 0
+    
+    logPhi = math.log((1 + math.sqrt(5)) / 2)
+    estimate = int((math.log(bound) + math.log(math.sqrt(5))) / logPhi)
+    n = max(estimate, 1)
+    curr, nextVal = fibonacciPair(n)
+    
+    while curr > bound:
+        n -= 1
+        curr, nextVal = nextVal - curr, curr
+    while nextVal <= bound:
+        n += 1
+        curr, nextVal = nextVal, curr + nextVal
+    
+    # F(1) = F(2) = 1，取较大的序号
+    if n == 1:
+        n = 2
+    return n, curr
+
+
+def fibonacciDoubling(n, mod=None):
+    """
+    快速倍增法：由 F(k), F(k+1) 直接推出 F(2k), F(2k+1)
+    每一位只需3次大整数乘法，约为矩阵法的一半
+    mod不为None时计算 F(n) mod m
+    时间复杂度：O(log n)次乘法，计入大整数乘法为 O(M(n))
+    空间复杂度：O(1)个数，共 O(n) 位
+    """
+    if mod is None:
+        cached = tableLookup(n)
+        if cached is not None:
+            return cached
+    if n <= 0:
+        return 0
+    return fibonacciPair(n, mod)[0]
+
+
+# ==================== 线性递推部分 ====================
+# 一般的k阶常系数线性递推 a(n) = c1*a(n-1) + c2*a(n-2) + ... + ck*a(n-k)
+# Kitamasa法：求 x^n 对特征多项式 x^k - c1*x^(k-1) - ... - ck 取余的结果 r(x)，
+# 则 a(n) = r0*a(0) + r1*a(1) + ... + r(k-1)*a(k-1)
+
+
+def polyMulMod(p, q, coeffs, mod=None, counts=None):
+    """
+    两个次数小于k的多项式相乘，再对特征多项式取余（高次项 x^k 用递推系数替换）
+    counts: 可选的 [加减法次数, 乘法次数]，用于操作计数
+    时间复杂度：O(k^2)次乘法
+    """
+    k = len(coeffs)
+    product = [0] * (2 * k - 1)
+    for i, pi in enumerate(p):
+        if pi:
+            for j, qj in enumerate(q):
+                product[i + j] += pi * qj
+    
+    reductions = 0
+    for degree in range(2 * k - 2, k - 1, -1):
+        top = product[degree]
+        if top:
+            reductions += 1
+            for j, cj in enumerate(coeffs, 1):
+                product[degree - j] += top * cj
+    
+    if counts is not None:
+        pairs = sum(1 for pi in p if pi) * k
+        counts[0] += pairs + reductions * k
+        counts[1] += pairs + reductions * k
+    result = product[:k]
+    if mod is not None:
+        result = [value % mod for value in result]
+    return result
+
+
+def polyShiftMod(p, coeffs, mod=None, counts=None):
+    """多项式乘以x，再对特征多项式取余，O(k)"""
+    top = p[-1]
+    result = [0] + p[:-1]
+    if top:
+        for j, cj in enumerate(coeffs, 1):
+            result[len(coeffs) - j] += top * cj
+        if counts is not None:
+            counts[0] += len(coeffs)
+            counts[1] += len(coeffs)
+    if mod is not None:
+        result = [value % mod for value in result]
+    return result
+
+
+def linearRecurrence(coeffs, initial, n, mod=None, counts=None):
+    """
+    Kitamasa法计算k阶线性递推的第n项
+    coeffs: [c1, c2, ..., ck]，a(n) = c1*a(n-1) + ... + ck*a(n-k)
+    initial: [a(0), a(1), ..., a(k-1)]
+    mod不为None时计算 a(n) mod m
+    时间复杂度：O(k^2 log n)次乘法
+    空间复杂度：O(k)个数
+    """
+    k = len(coeffs)
+    if k == 0 or len(initial) != k:
+        raise ValueError("递推系数和初始值的个数必须相同且不为0")
+    if n < 0:
+        raise ValueError("n必须为非负整数")
+    if n < k:
+        return initial[n] if mod is None else initial[n] % mod
+    
+    # 从最高位开始逐位平方，遇到1再乘x：r(x) = x^n mod P(x)
+    r = [1] + [0] * (k - 1)
+    if mod is None:
+        r[0] = bigInt(1)
+    for bit in range(n.bit_length() - 1, -1, -1):
+        r = polyMulMod(r, r, coeffs, mod, counts)
+        if (n >> bit) & 1:
+            r = polyShiftMod(r, coeffs, mod, counts)
+    
+    if counts is not None:
+        counts[0] += k - 1
+        counts[1] += k
+    result = sum(ri * ai for ri, ai in zip(r, initial))
+    return int(result) if mod is None else result % mod
+
+
+def fibonacciKitamasa(n):
+    """
+    线性递推法：用通用的Kitamasa引擎计算 F(n)（系数[1, 1]，初始值[0, 1]）
+    时间复杂度：O(k^2 log n)次乘法，k=2
+    空间复杂度：O(k)个数
+    """
+    return linearRecurrence([1, 1], [0, 1], n)
+
+
+def lucasNumber(n, mod=None):
+    """卢卡斯数 L(n) = L(n-1) + L(n-2)，L(0)=2, L(1)=1"""
+    return linearRecurrence([1, 1], [2, 1], n, mod)
+
+
+def tribonacci(n, mod=None):
+    """三阶斐波那契数 T(n) = T(n-1) + T(n-2) + T(n-3)，T(0)=T(1)=0, T(2)=1"""
+    return linearRecurrence([1, 1, 1], [0, 0, 1], n, mod)
+
+
+# ==================== 取模计算部分 ====================
+
+PISANO_MAX_MODULUS = 10 ** 12   # 超过此值的模数不做试除分解，直接按原n计算
+MOD_METHODS = {
+    "iterative": fibonacciIterativeImproved,
+    "matrix": fibonacciMatrix,
+    "doubling": fibonacciDoubling
+}
+
+# 模数 -> Pisano周期 π(m)，跨多次查询保留
+pisanoCache = {}
+
+
+def factorize(n):
+    """试除法质因数分解，返回 {质数: 指数}"""
+    factors = {}
+    d = 2
+    while d * d <= n:
+        while n % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            n //= d
+        d += 1 if d == 2 else 2
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+def isPisanoPeriod(period, m):
+    """period是否为斐波那契数列模m的周期，即 F(period) ≡ 0 且 F(period+1) ≡ 1 (mod m)"""
+    return fibonacciPair(period, m) == (0, 1 % m)
+
+
+def pisanoPeriod(m):
+    """
+    Pisano周期 π(m)：斐波那契数列模m的最小正周期，结果按模数缓存
+    π(m) = lcm(π(p^k))，且 π(p^k) 整除 p^(k-1)·π(p)；
+    π(2) = 3，π(5) = 20，p ≡ ±1 (mod 5) 时 π(p) 整除 p-1，p ≡ ±2 (mod 5) 时整除 2(p+1)
+    先取这个已知的倍数，再逐个去掉质因子，直到不再是周期，即得最小周期
+    """
+    if m in pisanoCache:
+        return pisanoCache[m]
+    
+    period = 1
+    for p, k in factorize(m).items():
+        if p == 2:
+            base = 3
+        elif p == 5:
+            base = 20
+        elif p % 5 in (1, 4):
+            base = p - 1
+        else:
+            base = 2 * (p + 1)
+        
+        modulus = p ** k
+        candidate = base * p ** (k - 1)
+        for q in factorize(candidate):
+            while candidate % q == 0 and isPisanoPeriod(candidate // q, modulus):
+                candidate //= q
+        period = period * candidate // math.gcd(period, candidate)
+    
+    pisanoCache[m] = period
+    return period
+
+
+def fibonacciMod(n, m, method="doubling"):
+    """
+    计算 F(n) mod m：先用缓存的Pisano周期把n缩小到 π(m) 以内，再按method计算
+    method: "iterative" / "matrix" / "doubling"
+    首次遇到某个模数时需要分解求周期，之后同一模数的查询只需 O(log m) 次小整数运算
+    """
+    if m < 1:
+        raise ValueError("模数必须为正整数")
+    if m <= PISANO_MAX_MODULUS:
+        n %= pisanoPeriod(m)
+    return MOD_METHODS[method](n, m)
+
+
+# ==================== 流式计算部分 ====================
+
+STREAM_CHECK_MODULUS = (1 << 61) - 1  # 恢复检查点时用于快速校验状态的模数
+
+
+class FibonacciStream:
+    """
+    斐波那契数列迭代器：只保存 (index, prev, curr)，其中 curr = F(index)，prev = F(index-1)
+    内存只与当前值的位数有关，与已经走过的项数无关
+    状态可保存到检查点文件，之后从同一位置继续，不必从F(0)重新开始
+    迭代时依次产生 (序号, 值)
+    """
+    
+    def __init__(self, start=0, checkpointPath=None, checkpointEvery=None):
+        self.index = 0
+        self.prev = 1  # F(-1) = 1，使 F(1) = F(-1) + F(0) 成立
+        self.curr = 0
+        self.checkpointPath = checkpointPath
+        self.checkpointEvery = checkpointEvery
+        if start > 0:
+            self.seek(start)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        """产生当前项并前进一步，按设置的间隔自动保存检查点"""
+        item = (self.index, self.curr)
+        self.prev, self.curr = self.curr, self.prev + self.curr
+        self.index += 1
+        if self.checkpointEvery and self.index % self.checkpointEvery == 0:
+            self.checkpoint()
+        return item
+    
+    def peekNext(self):
+        """下一项的值 F(index+1)，不前进"""
+        return self.prev + self.curr
+    
+    def seek(self, n):
+        """用快速倍增直接跳到第n项，O(log n)次乘法"""
+        if n <= 0:
+            self.index, self.prev, self.curr = 0, 1, 0
+            return
+        prev, curr = fibonacciPair(n - 1)
+        self.index, self.prev, self.curr = n, prev, curr
+    
+    def checkpoint(self, path=None):
+        """
+        把 (index, prev, curr) 写入检查点文件（JSON，大整数用十六进制，转换代价为线性）
+        先写临时文件再替换，中途退出不会破坏已有的检查点
+        """
+        path = path or self.checkpointPath
+        if path is None:
+            raise ValueError("未指定检查点文件")
+        state = {
+            "index": self.index,
+            "prev": format(self.prev, "x"),
+            "curr": format(self.curr, "x")
+        }
+        tempPath = path + ".tmp"
+        with open(tempPath, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tempPath, path)
+    
+    @classmethod
+    def resume(cls, path, checkpointEvery=None):
+        """从检查点文件恢复，并用取模的快速倍增校验状态是否正确"""
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        
+        stream = cls(checkpointPath=path, checkpointEvery=checkpointEvery)
+        stream.index = state["index"]
+        stream.prev = int(state["prev"], 16)
+        stream.curr = int(state["curr"], 16)
+        
+        expected = fibonacciPair(stream.index, STREAM_CHECK_MODULUS)
+        actual = (stream.curr % STREAM_CHECK_MODULUS, stream.peekNext() % STREAM_CHECK_MODULUS)
+        if stream.index < 0 or expected != actual:
+            raise ValueError(f"检查点文件已损坏: {path}")
+        return stream
+
+
+# ==================== 查表部分 ====================
+# 预计算表文件格式（整数均为小端）：
+#   头部:   魔数 FIB_TABLE_MAGIC（8字节） + 项数count（uint64）
+#   索引:   count个uint64，第n项记录在文件中的偏移
+#   记录:   长度（uint32） + F(n)的小端字节
+# 文件大小随最大序号平方增长（F(n)约0.087n字节），默认只预计算到 FIB_TABLE_MAX_N
+
+FIB_TABLE_MAGIC = b"FIBTAB01"
+FIB_TABLE_HEADER = struct.Struct("<8sQ")
+FIB_TABLE_OFFSET = struct.Struct("<Q")
+FIB_TABLE_LENGTH = struct.Struct("<I")
+FIB_TABLE_MAX_N = 20000  # 默认预计算的最大序号（约17MB）
+FIB_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fibonacci_table.bin")
+
+
+def estimateTableBytes(maxN):
+    """
+    估算 F(0)..F(maxN) 表文件的大小（字节）
+    F(k)约占 k*log10(φ)/log10(2)/8 字节，数据部分随maxN平方增长
+    """
+    count = maxN + 1
+    dataBytes = LOG10_PHI / LOG10_2 / 8 * maxN * count / 2
+    return int(FIB_TABLE_HEADER.size + (FIB_TABLE_OFFSET.size + FIB_TABLE_LENGTH.size + 1) * count + dataBytes)
+
+
+def buildFibonacciTable(path=FIB_TABLE_PATH, maxN=FIB_TABLE_MAX_N):
+    """
+    预计算 F(0)..F(maxN) 并写入表文件
+    先写临时文件再替换，中途退出不会破坏已有的表
+    时间复杂度：O(maxN^2)位运算（加法和写出）
+    """
+    count = maxN + 1
+    dataStart = FIB_TABLE_HEADER.size + FIB_TABLE_OFFSET.size * count
+    offsets = array('Q')
+    tempPath = path + ".tmp"
+    with open(tempPath, "wb") as f:
+        f.write(FIB_TABLE_HEADER.pack(FIB_TABLE_MAGIC, count))
+        f.seek(dataStart)
+        offset = dataStart
+        prev, curr = 0, 1
+        for _ in range(count):
+            data = prev.to_bytes((prev.bit_length() + 7) // 8, "little")
+            f.write(FIB_TABLE_LENGTH.pack(len(data)))
+            f.write(data)
+            offsets.append(offset)
+            offset += FIB_TABLE_LENGTH.size + len(data)
+            prev, curr = curr, prev + curr
+        
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        f.seek(FIB_TABLE_HEADER.size)
+        f.write(offsets.tobytes())
+    os.replace(tempPath, path)
+
+
+class FibonacciTable:
+    """
+    内存映射的预计算表：按序号O(1)定位记录，直接从映射内存转换为整数，不复制整个文件
+    """
+    
+    def __init__(self, path=FIB_TABLE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.count = FIB_TABLE_HEADER.unpack_from(self.mm, 0)
+            if magic != FIB_TABLE_MAGIC:
+                raise ValueError(f"不是斐波那契表文件: {path}")
+            if FIB_TABLE_HEADER.size + FIB_TABLE_OFFSET.size * self.count > len(self.mm):
+                raise ValueError(f"表文件已损坏: {path}")
+        except Exception:
+            self.mm.close()
+            raise
+        self.view = memoryview(self.mm)
+    
+    def __len__(self):
+        return self.count
+    
+    def get(self, n):
+        """读取F(n)，n超出表的范围时返回None"""
+        if not 0 <= n < self.count:
+            return None
+        offset, = FIB_TABLE_OFFSET.unpack_from(self.mm, FIB_TABLE_HEADER.size + FIB_TABLE_OFFSET.size * n)
+        length, = FIB_TABLE_LENGTH.unpack_from(self.mm, offset)
+        start = offset + FIB_TABLE_LENGTH.size
+        return int.from_bytes(self.view[start:start + length], "little")
+    
+    def close(self):
+        """释放内存映射"""
+        self.view.release()
+        self.mm.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excInfo):
+        self.close()
+
+
+# 当前加载的表（None表示未加载），各算法在表的范围内直接查表
+fibonacciTable = None
+tableState = threading.local()  # 各线程独立的查表开关，计时时关闭
+
+
+def loadFibonacciTable(path=FIB_TABLE_PATH):
+    """加载表文件作为全局查表，文件不存在时返回None"""
+    global fibonacciTable
+    if not os.path.exists(path):
+        return None
+    table = FibonacciTable(path)
+    previous, fibonacciTable = fibonacciTable, table
+    if previous is not None:
+        previous.close()
+    return table
+
+
+def unloadFibonacciTable():
+    """卸载全局查表"""
+    global fibonacciTable
+    table, fibonacciTable = fibonacciTable, None
+    if table is not None:
+        table.close()
+
+
+def tableLookup(n):
+    """表已加载、n在表内且当前线程未关闭查表时返回F(n)，否则返回None"""
+    table = fibonacciTable
+    if table is None or getattr(tableState, "disabled", False):
+        return None
+    return table.get(n)
+
+
+@contextmanager
+def tableDisabled():
+    """在当前线程中临时关闭查表，保证计时测到的是算法本身"""
+    previous = getattr(tableState, "disabled", False)
+    tableState.disabled = True
+    try:
+        yield
+    finally:
+        tableState.disabled = previous
+
+
+# ==================== 批量计算部分 ====================
+
+UINT64_MAX_FIB_INDEX = 93  # F(93)是不超过2^64-1的最大斐波那契数
+
+
+def fibonacciRange(a, b):
+    """
+    批量计算 F(a)..F(b)（含两端），先用快速倍增定位F(a)，再一次遍历
+    全部值不超过uint64时返回uint64数组，否则返回Python大整数数组
+    有NumPy时返回numpy数组（uint64或object），否则返回array('Q')或列表
+    时间复杂度：O(log a + (b - a))次大整数加法
+    """
+    a = max(a, 0)
+    if b < a:
+        return np.array([], dtype=np.uint64) if np is not None else array('Q')
+    
+    values = [0] * (b - a + 1)
+    prev, curr = fibonacciPair(a)
+    for i in range(len(values)):
+        values[i] = prev
+        prev, curr = curr, prev + curr
+    
+    fitsUint64 = b <= UINT64_MAX_FIB_INDEX
+    if np is not None:
+        return np.array(values, dtype=np.uint64 if fitsUint64 else object)
+    return array('Q', values) if fitsUint64 else values
+
+
+def fibonacciFormulaRange(a, b):
+    """
+    向量化的浮点Binet公式：一次计算 F(a)..F(b) 的近似值（已四舍五入的浮点数）
+    与 fibonacciFormula 的精度相同，超出浮点范围的项为inf
+    有NumPy时返回float64数组，否则返回列表
+    """
+    a = max(a, 0)
+    sqrt5 = math.sqrt(5)
+    phi = (1 + sqrt5) / 2
+    psi = (1 - sqrt5) / 2
+    
+    if np is not None:
+        ns = np.arange(a, b + 1, dtype=np.float64)
+        with np.errstate(over='ignore', invalid='ignore'):
+            return np.rint((phi ** ns - psi ** ns) / sqrt5)
+    
+    values = []
+    for n in range(a, b + 1):
+        try:
+            values.append(float(round((phi ** n - psi ** n) / sqrt5)))
+        except OverflowError:
+            values.append(float('inf'))
+    return values
+
+
+# ==================== 精度扫描部分 ====================
+
+FORMULA_PRECISIONS = ("float32", "float64", "longdouble", "decimal:20", "decimal:40")
+FORMULA_SCAN_MAX_N = 400      # 精度扫描的默认上限（float32约在n=185溢出，40位decimal在n=180出错）
+FORMULA_CURVE_POINTS = 40     # 误差增长曲线的采样点数
+
+
+def precisionDigits(precision):
+    """精度名称对应的十进制有效位数，不可用（无NumPy）时返回None"""
+    if precision.startswith("decimal:"):
+        return int(precision.split(":")[1])
+    if precision not in ("float32", "float64", "longdouble"):
+        raise ValueError(f"未知精度: {precision}")
+    if precision == "float64":
+        return sys.float_info.dig
+    if np is None:
+        return None
+    return int(np.finfo(getattr(np, precision)).precision)
+
+
+def formulaApproximations(precision, a, b):
+    """
+    依次产生Binet公式在给定精度下对 F(a)..F(b) 的近似值（四舍五入后的精确整数）
+    溢出的项为None
+    precision: "float32" / "float64" / "longdouble"（后两者之外的浮点需NumPy）或 "decimal:k"（k位有效数字）
+    """
+    if precision.startswith("decimal:"):
+        with localcontext() as ctx:
+            ctx.prec = int(precision.split(":")[1])
+            sqrt5 = Decimal(5).sqrt()
+            phi = (1 + sqrt5) / 2
+            psi = (1 - sqrt5) / 2
+            for n in range(a, b + 1):
+                value = ((phi ** n - psi ** n) / sqrt5).to_integral_value(ROUND_HALF_EVEN)
+                yield int(value)
+        return
+    
+    if np is None:
+        if precision != "float64":
+            raise ValueError(f"{precision} 需要NumPy")
+        for value in fibonacciFormulaRange(a, b):
+            yield int(value) if math.isfinite(value) else None
+        return
+    
+    dtype = getattr(np, precision)
+    sqrt5 = np.sqrt(dtype(5))
+    phi = (dtype(1) + sqrt5) / dtype(2)
+    psi = (dtype(1) - sqrt5) / dtype(2)
+    ns = np.arange(a, b + 1).astype(dtype)
+    with np.errstate(over='ignore', invalid='ignore'):
+        values = np.rint((phi ** ns - psi ** ns) / sqrt5)
+    for value in values:
+        if not np.isfinite(value):
+            yield None
+        else:
+            numerator, denominator = value.as_integer_ratio()
+            yield numerator // denominator
+
+
+def scanFormulaPrecisions(a=1, b=FORMULA_SCAN_MAX_N, precisions=FORMULA_PRECISIONS,
+                          curvePoints=FORMULA_CURVE_POINTS):
+    """
+    一次线性扫描 F(a)..F(b)，精确值逐项递推，同时比较各精度下的公式法结果
+    无NumPy时跳过float32和longdouble
+    返回：每种精度一条记录（precision、digits、firstN、formula、exact、curve），
+          curve为误差增长曲线 [(n, 绝对误差, 相对误差)]，溢出时误差为inf
+    """
+    a = max(a, 0)
+    precisions = [p for p in precisions if precisionDigits(p) is not None]
+    records = [{"precision": p, "digits": precisionDigits(p), "firstN": None,
+                "formula": None, "exact": None, "curve": []} for p in precisions]
+    if b < a:
+        return records
+    
+    step = max(1, (b - a + 1) // curvePoints)
+    streams = [formulaApproximations(p, a, b) for p in precisions]
+    prev, curr = fibonacciPair(a)
+    for n in range(a, b + 1):
+        exact = prev
+        for record, stream in zip(records, streams):
+            approx = next(stream)
+            error = float('inf') if approx is None else abs(approx - exact)
+            diverged = error != 0
+            if diverged and record["firstN"] is None:
+                record.update(firstN=n, formula=approx, exact=exact)
+            elif (n - a) % step != 0 and n != b:
+                continue
+            relError = error / exact if exact else float(error)
+            record["curve"].append((n, error, relError))
+        prev, curr = curr, prev + curr
+    return records
+
+
+# ==================== 记忆化递归部分 ====================
+
+FIB_CACHE_SIZE = 4096          # 默认缓存容量（条目数）
+FIB_CACHE_MIN_SIZE = 3         # 最小容量：LRU下读取F(n-2)会把F(n-1)挤到队首，容量2时递归退化为指数级
+FIB_CACHE_POLICIES = ("lru", "fifo")
+MEMO_RECURSION_STEP = 200      # 记忆化递归分段预热的步长，限制递归深度
+
+
+class FibonacciCache:
+    """
+    有界缓存：容量满时按淘汰策略删除条目
+    policy="lru"  淘汰最久未被访问的条目
+    policy="fifo" 淘汰最早写入的条目
+    同时统计命中、未命中和淘汰次数
+    """
+    
+    def __init__(self, maxSize=FIB_CACHE_SIZE, policy="lru"):
+        self.lock = threading.Lock()  # 多个后台任务可能同时访问
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.configure(maxSize, policy)
+    
+    def configure(self, maxSize, policy):
+        """修改容量和淘汰策略，容量变小时立即淘汰多余条目"""
+        if maxSize < FIB_CACHE_MIN_SIZE:
+            raise ValueError(f"缓存容量至少为{FIB_CACHE_MIN_SIZE}")
+        if policy not in FIB_CACHE_POLICIES:
+            raise ValueError(f"未知的淘汰策略: {policy}")
+        with self.lock:
+            self.maxSize = maxSize
+            self.policy = policy
+            self.evict()
+    
+    def get(self, key):
+        """查询缓存，未命中返回None"""
+        with self.lock:
+            value = self.data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.policy == "lru":
+                self.data.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        """写入缓存，超出容量时淘汰"""
+        with self.lock:
+            self.data[key] = value
+            if self.policy == "lru":
+                self.data.move_to_end(key)
+            self.evict()
+    
+    def evict(self):
+        """淘汰超出容量的条目（OrderedDict头部即为最旧条目），调用方需持有锁"""
+        while len(self.data) > self.maxSize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        """清空缓存和统计"""
+        with self.lock:
+            self.data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def __len__(self):
+        return len(self.data)
+    
+    def stats(self):
+        """返回统计信息字符串"""
+        total = self.hits + self.misses
+        hitRate = self.hits / total * 100 if total else 0.0
+        return (f"命中 {self.hits} 次, 未命中 {self.misses} 次, 命中率 {hitRate:.2f}%, "
+                f"淘汰 {self.evictions} 次, 当前 {len(self)}/{self.maxSize} 条 ({self.policy.upper()})")
+
+
+# 全局共享缓存，跨多次按钮调用保留结果
+fibonacciCache = FibonacciCache()
+
+
+def memoRecursive(n, cache):
+    """带缓存的递归主体"""
+    if n <= 0:
+        return 0
+    if n == 1:
+        return 1
+    
+    value = cache.get(n)
+    if value is None:
+        value = memoRecursive(n - 1, cache) + memoRecursive(n - 2, cache)
+        cache.put(n, value)
+    return value
+
+
+def fibonacciRecursiveMemo(n, cache=None):
+    """
+    记忆化递归法：递归结构不变，已算过的F(k)直接从有界缓存读取
+    大n时按MEMO_RECURSION_STEP分段预热，保证递归深度不超过步长
+    时间复杂度：O(n)（缓存命中时更少）
+    空间复杂度：O(缓存容量)
+    """
+    if cache is None:
+        cache = fibonacciCache
+    
+    # 每段结束后F(k)和F(k-1)都是最新写入的条目，下一段递归到此即命中
+    for k in range(MEMO_RECURSION_STEP, n, MEMO_RECURSION_STEP):
+        memoRecursive(k, cache)
+    
+    return memoRecursive(n, cache)
+
+
+# ==================== 操作计数部分 ====================
+# 各方法的插桩版本：执行与原方法相同的运算，同时统计实际的加减法和乘法次数
+# 返回：(结果, 加减法次数, 乘法次数)
+
+RECURSIVE_COUNT_MAX_N = 30  # 超过此值时递归法的操作数由递推式得出，不再实际插桩执行
+
+
+def countIterative(n):
+    """迭代法（数组）插桩版本"""
+    if n <= 0:
+        return 0, 0, 0
+    if n == 1:
+        return 1, 0, 0
+    
+    additions = 0
+    fibArray = [0] * (n + 1)
+    fibArray[1] = 1
+    for i in range(2, n + 1):
+        fibArray[i] = fibArray[i - 1] + fibArray[i - 2]
+        additions += 1
+    return fibArray[n], additions, 0
+
+
+def countIterativeWindow(n):
+    """迭代法（滑动窗口）插桩版本"""
+    additions = 0
+    window = deque([0], maxlen=FIB_WINDOW_SIZE)
+    prev, curr = 0, 1
+    for i in range(1, n + 1):
+        window.append(curr)
+        prev, curr = curr, prev + curr
+        additions += 1
+    # 循环最后一次的加法算出的是F(n+1)，并未使用
+    return window[-1], max(additions - 1, 0), 0
+
+
+def countIterativeImproved(n):
+    """迭代改进法插桩版本"""
+    if n <= 0:
+        return 0, 0, 0
+    if n == 1:
+        return 1, 0, 0
+    
+    additions = 0
+    prev, curr = 0, 1
+    for i in range(2, n + 1):
+        prev, curr = curr, prev + curr
+        additions += 1
+    return curr, additions, 0
+
+
+def countRecursive(n):
+    """
+    递归法插桩版本：实际执行递归并统计加法次数
+    n超过RECURSIVE_COUNT_MAX_N时改用递推式 A(n) = A(n-1) + A(n-2) + 1 得出（与插桩结果相同）
+    """
+    if n > RECURSIVE_COUNT_MAX_N:
+        prevOps, currOps = 0, 0  # A(0), A(1)
+        for i in range(2, n + 1):
+            prevOps, currOps = currOps, prevOps + currOps + 1
+        return fibonacciIterativeImproved(n), currOps, 0
+    
+    additions = 0
+    
+    def recursive(k):
+        nonlocal additions
+        if k <= 0:
+            return 0
+        if k == 1:
+            return 1
+        additions += 1
+        return recursive(k - 1) + recursive(k - 2)
+    
+    return recursive(n), additions, 0
+
+
+def countFormula(n):
+    """公式法插桩版本（浮点运算：开方、两次幂、加减和除法）"""
+    if n <= 0:
+        return 0, 0, 0
+    
+    sqrt5 = math.sqrt(5)
+    phi = (1 + sqrt5) / 2
+    psi = (1 - sqrt5) / 2
+    result = (phi ** n - psi ** n) / sqrt5
+    # 加减: 1+sqrt5, 1-sqrt5, φ^n-ψ^n；乘除: 开方, /2, /2, 两次幂, /sqrt5
+    return int(round(result)), 3, 6
+
+
+def countFormulaDecimal(n):
+    """公式法（高精度）插桩版本：按实际执行的牛顿迭代、快速幂和分治转换统计高精度运算"""
+    if n <= 0:
+        return 0, 0, 0
+    
+    additions = 0
+    multiplications = 0
+    
+    # 牛顿迭代 y + y(1 - 5y^2)/2：每轮 4 次乘除、2 次加减
+    newtonSteps = len(invSqrt5Schedule(formulaDecimalPrecision(n)))
+    multiplications += 4 * newtonSteps
+    additions += 2 * newtonSteps
+    
+    # φ = (1 + 5y)/2，φ^n 二进制快速幂，再乘 1/sqrt(5)
+    multiplications += 2 + (n.bit_length() - 1) + (bin(n).count("1") - 1) + 1
+    additions += 1
+    
+    result = fibonacciFormulaDecimal(n)
+    
+    # 分治转换：每次拆分 1 次乘法、2 次加减
+    def splitCount(digits):
+        if digits <= DECIMAL_SPLIT_DIGITS:
+            return 0
+        k = digits // 2
+        return 1 + splitCount(digits - k) + splitCount(k)
+    
+    splits = splitCount(decimalDigits(result))
+    multiplications += splits
+    additions += 2 * splits
+    return result, additions, multiplications
+
+
+def countMatrix(n):
+    """矩阵法插桩版本：每次2x2矩阵乘法为8次乘法、4次加法"""
+    if n <= 0:
+        return 0, 0, 0
+    if n == 1:
+        return 1, 0, 0
+    
+    additions = 0
+    multiplications = 0
+    r00, r01, r10, r11 = 1, 0, 0, 1
+    b00, b01, b10, b11 = 1, 1, 1, 0
+    power = n
+    
+    while power > 0:
+        if power & 1:
+            r00, r01, r10, r11 = (r00 * b00 + r01 * b10, r00 * b01 + r01 * b11,
+                                  r10 * b00 + r11 * b10, r10 * b01 + r11 * b11)
+            additions += 4
+            multiplications += 8
+        power >>= 1
+        if power:
+            b00, b01, b10, b11 = (b00 * b00 + b01 * b10, b00 * b01 + b01 * b11,
+                                  b10 * b00 + b11 * b10, b10 * b01 + b11 * b11)
+            additions += 4
+            multiplications += 8
+    
+    return r01, additions, multiplications
+
+
+def countDoubling(n):
+    """快速倍增法插桩版本：每一位3次乘法、2次加减，奇数位再加1次加法"""
+    if n <= 0:
+        return 0, 0, 0
+    
+    additions = 0
+    multiplications = 0
+    a, b = 0, 1
+    for bit in range(n.bit_length() - 1, -1, -1):
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        additions += 2
+        multiplications += 3
+        if (n >> bit) & 1:
+            a, b = d, c + d
+            additions += 1
+        else:
+            a, b = c, d
+    
+    return a, additions, multiplications
+
+
+def countKitamasa(n):
+    """线性递推法插桩版本：由引擎按多项式乘法累计操作次数"""
+    counts = [0, 0]
+    result = linearRecurrence([1, 1], [0, 1], n, counts=counts)
+    return result, counts[0], counts[1]
+
+
+# ==================== 子进程超时部分 ====================
+
+PROCESS_POLL_INTERVAL = 0.05  # 等待子进程时的轮询间隔（秒）
+
+
+def timedCall(conn, func, args, keepResult):
+    """
+    子进程入口：计时执行未经修改的 func(*args)，通过管道发回 (状态, 结果, 耗时)
+    计时只包含算法本身，不含进程启动和结果传输
+    """
+    try:
+        with tableDisabled():
+            startTime = time.perf_counter()
+            result = func(*args)
+            elapsedTime = time.perf_counter() - startTime
+        conn.send(("ok", result if keepResult else None, elapsedTime))
+    except Exception as e:
+        conn.send(("error", str(e), 0.0))
+    finally:
+        conn.close()
+
+
+class TimedProcess:
+    """
+    在独立子进程中运行函数，超过期限即强制结束
+    status: "running" / "ok" / "error" / "timeout" / "cancelled"
+    """
+    
+    def __init__(self, func, args=(), timeout=None, keepResult=True):
+        self.func = func
+        self.args = args
+        self.timeout = timeout
+        self.keepResult = keepResult
+        self.status = "running"
+        self.result = None
+        self.elapsedTime = 0.0
+        self.process = None
+        self.conn = None
+        self.startTime = None
+    
+    def start(self):
+        """启动子进程"""
+        parentConn, childConn = multiprocessing.Pipe(duplex=False)
+        self.conn = parentConn
+        self.process = multiprocessing.Process(target=timedCall, daemon=True,
+                                               args=(childConn, self.func, self.args, self.keepResult))
+        self.startTime = time.perf_counter()
+        self.process.start()
+        childConn.close()
+        return self
+    
+    def poll(self, wait=0.0):
+        """检查子进程是否结束（最多等待wait秒），超过期限则强制结束，返回是否已结束"""
+        if self.status != "running":
+            return True
+        
+        if self.conn.poll(wait):
+            try:
+                self.status, self.result, self.elapsedTime = self.conn.recv()
+            except EOFError:
+                self.status, self.result = "error", "子进程异常退出"
+                self.elapsedTime = time.perf_counter() - self.startTime
+            self.finish()
+            return True
+        
+        if not self.process.is_alive():
+            self.status, self.result = "error", f"子进程异常退出（退出码 {self.process.exitcode}）"
+            self.elapsedTime = time.perf_counter() - self.startTime
+            self.finish()
+            return True
+        
+        if self.timeout is not None and time.perf_counter() - self.startTime > self.timeout:
+            self.kill("timeout")
+            return True
+        return False
+    
+    def kill(self, status="cancelled"):
+        """强制结束子进程"""
+        if self.status == "running":
+            self.status = status
+            self.elapsedTime = time.perf_counter() - self.startTime
+        self.finish()
+    
+    def finish(self):
+        """回收子进程和管道"""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def runWithTimeout(func, args=(), timeout=60, keepResult=True, shouldStop=None):
+    """
+    在子进程中运行 func(*args)，超过timeout秒强制结束
+    shouldStop: 可选的无参回调，返回True时提前终止（用于界面取消）
+    返回：(状态, 结果, 耗时秒)，状态为 "ok" / "error" / "timeout" / "cancelled"
+    """
+    task = TimedProcess(func, args, timeout, keepResult).start()
+    while not task.poll(PROCESS_POLL_INTERVAL):
+        if shouldStop is not None and shouldStop():
+            task.kill("cancelled")
+    return task.status, task.result, task.elapsedTime
+
+
+# ==================== 基准测试部分 ====================
+
+BENCH_MIN_TIME = 0.05      # 每次重复的最短总时长（秒），单次调用太快时自动增加循环次数
+BENCH_MAX_TIME = 2.0       # 单个方法计时的总时长上限（秒）
+BENCH_REPEAT = 7           # 默认重复次数
+RECURSIVE_MAX_N = 35       # 比较时递归法允许的最大n
+COMPARE_TIMEOUT = 60       # 并行比较时单个方法的期限（秒）
+
+# 参与比较的方法：(名称, 函数, 插桩计数函数)
+FIBONACCI_METHODS = [
+    ("迭代法（数组）", fibonacciIterative, countIterative),
+    ("迭代法（滑动窗口）", fibonacciIterativeWindow, countIterativeWindow),
+    ("迭代改进法", fibonacciIterativeImproved, countIterativeImproved),
+    ("递归法", fibonacciRecursive, countRecursive),
+    ("公式法", fibonacciFormula, countFormula),
+    ("公式法（高精度）", fibonacciFormulaDecimal, countFormulaDecimal),
+    ("矩阵法", fibonacciMatrix, countMatrix),
+    ("快速倍增法", fibonacciDoubling, countDoubling),
+    ("线性递推法（Kitamasa）", fibonacciKitamasa, countKitamasa)
+]
+
+
+MEMORY_PROBE_RECURSIVE_MAX_N = 25  # tracemalloc会让递归明显变慢，超过此n不测递归法的内存
+
+
+def measurePeakMemory(func, n):
+    """
+    用tracemalloc测量一次 func(n) 的峰值内存分配（字节）
+    返回：(结果, 峰值字节数)
+    """
+    wasTracing = tracemalloc.is_tracing()
+    if not wasTracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        with tableDisabled():
+            result = func(n)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not wasTracing:
+            tracemalloc.stop()
+    return result, max(peak - baseline, 0)
+
+
+def peakMemoryBytes(func, n, backend):
+    """子进程入口：切换到父进程的大整数后端后测量 func(n) 的峰值内存，只返回字节数"""
+    setIntBackend(backend)
+    return measurePeakMemory(func, n)[1]
+
+
+def measurePeakMemoryIsolated(func, n, timeout=COMPARE_TIMEOUT):
+    """
+    tracemalloc按整个进程统计：其他线程同时分配的内存会计入峰值，其他线程的stop()也会清空读数
+    当前进程只有一个线程时直接测量，否则在独立子进程中测量
+    返回：峰值字节数，子进程出错或超时返回None
+    """
+    if threading.active_count() == 1:
+        return measurePeakMemory(func, n)[1]
+    status, peak, _ = runWithTimeout(peakMemoryBytes, (func, n, intBackend), timeout)
+    return peak if status == "ok" else None
+
+
+def timeLoops(func, n, loops):
+    """连续执行loops次 func(n)，返回总耗时（纳秒），计时期间关闭查表"""
+    with tableDisabled():
+        startTime = time.perf_counter_ns()
+        for _ in range(loops):
+            func(n)
+        return time.perf_counter_ns() - startTime
+
+
+def percentile(sortedValues, fraction):
+    """最近秩法求分位数，sortedValues需已升序"""
+    index = max(0, math.ceil(fraction * len(sortedValues)) - 1)
+    return sortedValues[index]
+
+
+def benchmark(func, n, repeat=BENCH_REPEAT, minTime=BENCH_MIN_TIME, maxTime=BENCH_MAX_TIME):
+    """
+    高精度计时（perf_counter_ns）
+    1. 首次调用作为预热并取得结果；若已超过maxTime，直接以它作为唯一样本
+    2. 循环次数按1, 2, 5, 10, 20, 50...递增，直到一次重复的总耗时达到minTime
+    3. 在maxTime内最多重复repeat次，统计单次调用耗时
+    返回：字典 {result, loops, repeat, minNs, medianNs, p95Ns, meanNs}
+    """
+    with tableDisabled():
+        startTime = time.perf_counter_ns()
+        result = func(n)
+        warmupTime = time.perf_counter_ns() - startTime
+    
+    if warmupTime >= maxTime * 1e9:
+        samples = [warmupTime]
+        loops = 1
+    else:
+        loops = 1
+        multipliers = (1, 2, 5)
+        step = 0
+        while True:
+            loops = multipliers[step % 3] * 10 ** (step // 3)
+            elapsed = timeLoops(func, n, loops)
+            if elapsed >= minTime * 1e9:
+                break
+            step += 1
+        
+        repeatCount = max(1, min(repeat, int(maxTime * 1e9 // elapsed)))
+        samples = [elapsed / loops]
+        for _ in range(repeatCount - 1):
+            samples.append(timeLoops(func, n, loops) / loops)
+    
+    samples.sort()
+    return {
+        "result": result,
+        "loops": loops,
+        "repeat": len(samples),
+        "minNs": samples[0],
+        "medianNs": statistics.median(samples),
+        "p95Ns": percentile(samples, 0.95),
+        "meanNs": statistics.fmean(samples)
+    }
+
+
+def exportBenchmarkResults(results, path):
+    """
+    导出基准测试结果，按扩展名选择格式（.json 或 .csv）
+    大整数结果只导出位数，避免文件过大
+    """
+    rows = []
+    for r in results:
+        row = {key: value for key, value in r.items() if key != "result"}
+        row["resultDigits"] = decimalDigits(r["result"]) if isinstance(r.get("result"), int) else None
+        rows.append(row)
+    
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            fieldNames = list(dict.fromkeys(key for row in rows for key in row))
+            writer = csv.DictWriter(f, fieldnames=fieldNames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+# ==================== 复杂度拟合部分 ====================
+
+SWEEP_START_N = 8              # 扫描起点
+SWEEP_MAX_N = 1 << 22          # 扫描终点
+SWEEP_POINT_TIME = 0.5         # 单点耗时超过此值（秒）后停止该方法的扫描
+SWEEP_METHOD_MAX_N = {         # 个别方法的扫描上限（数组法的内存为 O(n^2) 位）
+    "迭代法（数组）": 1 << 16,
+    "递归法": RECURSIVE_MAX_N
+}
+
+
+def geometricRange(start, stop, factor=2):
+    """start到stop之间按factor倍增长的整数序列（含start，不超过stop）"""
+    values = []
+    n = start
+    while n <= stop:
+        values.append(n)
+        n = max(n + 1, int(n * factor))
+    return values
+
+
+def documentedComplexity(func):
+    """从函数文档字符串中取出“时间复杂度”一行，用于与实测结果对照"""
+    for line in (func.__doc__ or "").splitlines():
+        line = line.strip()
+        if line.startswith("时间复杂度"):
+            return line.split("：", 1)[-1]
+    return "未注明"
+
+
+def scalingSweep(func, ns, pointTime=SWEEP_POINT_TIME, onPoint=None):
+    """
+    在一组n上测量 func 的中位耗时，单点耗时超过pointTime或计算失败即停止
+    onPoint: 可选回调 onPoint(n, 耗时秒)
+    返回：(样本列表 [(n, 耗时秒)], 停止原因或None)
+    """
+    samples = []
+    for n in ns:
+        try:
+            stats = benchmark(func, n, repeat=3, minTime=0.01, maxTime=pointTime)
+        except Exception as e:
+            return samples, f"n={n} 计算失败: {str(e)}"
+        elapsedTime = stats["medianNs"] / 1e9
+        samples.append((n, elapsedTime))
+        if onPoint is not None:
+            onPoint(n, elapsedTime)
+        if elapsedTime > pointTime:
+            return samples, f"n={n} 单点耗时超过 {pointTime} 秒"
+    return samples, None
+
+
+def localExponents(samples):
+    """相邻两点的局部复杂度指数 d(log t) / d(log n)，可看出方法在哪里开始变慢"""
+    exponents = []
+    for (n1, t1), (n2, t2) in zip(samples, samples[1:]):
+        exponents.append((n2, math.log(t2 / t1) / math.log(n2 / n1)))
+    return exponents
+
+
+# ==================== 时间预算部分 ====================
+
+BUDGET_SAMPLE_FRACTION = 0.1    # 标定样本的单次耗时达到预算的这一比例后停止采样
+BUDGET_MIN_SAMPLE_TIME = 1e-3   # 短于此耗时（秒）的样本噪声太大，不参与拟合
+BUDGET_FIT_SAMPLES = 4          # 用最近几个样本拟合增长模型
+BUDGET_SHRINK_FACTOR = 1.5      # 确认运行超时后，下一个候选以预算的1/此倍数为目标耗时
+
+
+def timeCall(func, n):
+    """在当前进程中计时执行一次 func(n)，返回耗时（秒），计时期间关闭查表"""
+    with tableDisabled():
+        startTime = time.perf_counter()
+        func(n)
+        return time.perf_counter() - startTime
+
+
+def fitGrowthModel(samples, model):
+    """
+    最小二乘拟合耗时增长模型，samples为 [(n, 耗时秒), ...]
+    model="exponential": log t = a + b*n      （递归法，b ≈ log φ）
+    model="power":       log t = a + b*log n  （迭代/矩阵/倍增，b为实测复杂度指数，含大整数运算开销）
+    返回：(a, b)
+    """
+    xs = [n if model == "exponential" else math.log(n) for n, _ in samples]
+    ys = [math.log(t) for _, t in samples]
+    count = len(xs)
+    meanX = sum(xs) / count
+    meanY = sum(ys) / count
+    varX = sum((x - meanX) ** 2 for x in xs)
+    if varX == 0:
+        return meanY, 0.0
+    b = sum((x - meanX) * (y - meanY) for x, y in zip(xs, ys)) / varX
+    return meanY - b * meanX, b
+
+
+def predictMaxN(a, b, model, budget):
+    """由拟合参数预测耗时恰好为budget的n"""
+    if b <= 0:
+        return None
+    x = (math.log(budget) - a) / b
+    return int(x) if model == "exponential" else int(math.exp(x))
+
+
+def refitCandidate(model, b, lowN, lowTime, highN, budget):
+    """
+    确认运行在highN超时后，给出 (lowN, highN) 之间的下一个候选n
+    超时说明 T(highN) > budget，实际增长指数至少为 (lowN, lowTime) 到 (highN, budget) 连线的斜率，
+    按二者中较大的指数从lowN外推到 budget / BUDGET_SHRINK_FACTOR；外推结果不在区间内时取中点
+    返回：候选n，区间内已无可试的整数时返回None
+    """
+    if highN - lowN <= 1:
+        return None
+    target = math.log(budget / BUDGET_SHRINK_FACTOR / lowTime)
+    if model == "exponential":
+        slope = max(b, math.log(budget / lowTime) / (highN - lowN))
+        candidate = lowN + int(target / slope)
+    else:
+        slope = max(b, math.log(budget / lowTime) / math.log(highN / lowN))
+        candidate = int(lowN * math.exp(target / slope))
+    if not lowN < candidate < highN:
+        candidate = (lowN + highN) // 2
+    return candidate
+
+
+def findMaxInTimeBudget(func, budget=30, model="power", startN=None, maxConfirmRuns=2,
+                        onSample=None, shouldStop=None):
+    """
+    预算搜索：求 budget 秒内 func 能计算的最大n
+    1. 从小n开始计时采样（指数模型每次n+1，幂律模型每次n翻倍），直到单次耗时达到预算的一小部分
+    2. 拟合增长模型并外推出预算边界
+    3. 在子进程中以预算为期限确认预测值；超时的n作为上界，与已完成的最大n一起重新拟合，
+       在二者之间选下一个候选，直到确认成功后上界未知或用完 maxConfirmRuns 次
+    总耗时约为标定的 BUDGET_SAMPLE_FRACTION 倍预算的几倍，加上最多 maxConfirmRuns 次预算
+    onSample: 可选回调 onSample(n, 耗时)，每个样本完成后调用
+    shouldStop: 可选回调，返回True时终止确认运行
+    返回：结果字典（n、time、predictedN、exponent、samples、runs、confirmed）
+    """
+    if startN is None:
+        startN = 15 if model == "exponential" else 1000
+    sampleLimit = budget * BUDGET_SAMPLE_FRACTION
+    
+    samples = []
+    n = startN
+    while True:
+        elapsedTime = timeCall(func, n)
+        samples.append((n, elapsedTime))
+        if onSample is not None:
+            onSample(n, elapsedTime)
+        if elapsedTime >= sampleLimit:
+            break
+        n = n + 1 if model == "exponential" else n * 2
+    
+    fitSamples = [sample for sample in samples if sample[1] >= BUDGET_MIN_SAMPLE_TIME]
+    if len(fitSamples) < 2:
+        fitSamples = samples
+    a, b = fitGrowthModel(fitSamples[-BUDGET_FIT_SAMPLES:], model)
+    predictedN = predictMaxN(a, b, model, budget)
+    
+    # 已完成的最大n（初始为采样中的最大值）和已超时的最小n
+    bestN, bestTime = samples[-1]
+    timeoutN = None
+    result = {
+        "n": bestN, "time": bestTime, "predictedN": predictedN, "model": model,
+        "exponent": b, "samples": samples, "runs": [], "confirmed": False
+    }
+    if predictedN is None or predictedN <= bestN:
+        return result
+    
+    candidate = predictedN
+    for _ in range(maxConfirmRuns):
+        status, _, elapsedTime = runWithTimeout(func, (candidate,), budget, keepResult=False,
+                                                shouldStop=shouldStop)
+        result["runs"].append((candidate, status, elapsedTime))
+        if status == "ok":
+            bestN, bestTime = candidate, elapsedTime
+            result.update(n=bestN, time=bestTime, confirmed=True)
+        elif status == "timeout":
+            timeoutN = candidate
+        else:
+            break
+        
+        # 预测值已确认且没有超时的上界时结束，否则在区间内继续逼近边界
+        if timeoutN is None:
+            break
+        candidate = refitCandidate(model, b, bestN, bestTime, timeoutN, budget)
+        if candidate is None:
+            break
+    
+    return result
+
+
+# ==================== 实验接口部分 ====================
+# 各项实验的无界面入口，返回结构化结果，图形界面和命令行共用
+
+ITERATIVE_SCAN_MAX_BITS = 65536  # 上界不超过此位数时，额外用逐项迭代交叉验证
+TIME_BUDGET_METHODS = [          # 时间预算搜索的方法及其增长模型
+    ("递归法", fibonacciRecursive, "exponential"),
+    ("迭代改进法", fibonacciIterativeImproved, "power"),
+    ("矩阵法", fibonacciMatrix, "power"),
+    ("快速倍增法", fibonacciDoubling, "power")
+]
+
+
+def selectMethods(methods, names):
+    """按显示名或函数名从方法表中挑选方法，names为空时返回全部"""
+    if not names:
+        return list(methods)
+    selected = []
+    for name in names:
+        matches = [method for method in methods if name in (method[0], method[1].__name__)]
+        if not matches:
+            raise ValueError(f"未知方法: {name}")
+        selected.extend(matches)
+    return selected
+
+
+def profileMethod(methodName, n, backend=None):
+    """
+    对单个方法计时、统计基本操作次数并测量峰值内存，返回一条比较记录
+    按显示名查找方法，便于作为子进程入口；backend不为None时先切换大整数后端
+    """
+    if backend is not None:
+        setIntBackend(backend)
+    _, methodFunc, countFunc = selectMethods(FIBONACCI_METHODS, [methodName])[0]
+    stats = benchmark(methodFunc, n)
+    _, additions, multiplications = countFunc(n)
+    if methodName == "递归法" and n > MEMORY_PROBE_RECURSIVE_MAX_N:
+        peakMemory = None
+    else:
+        peakMemory = measurePeakMemoryIsolated(methodFunc, n)
+    
+    return {
+        'name': methodName,
+        'n': n,
+        'status': "ok",
+        'backend': intBackend,
+        'result': stats['result'],
+        'loops': stats['loops'],
+        'repeat': stats['repeat'],
+        'minMs': stats['minNs'] / 1e6,
+        'medianMs': stats['medianNs'] / 1e6,
+        'p95Ms': stats['p95Ns'] / 1e6,
+        'meanMs': stats['meanNs'] / 1e6,
+        'additions': additions,
+        'multiplications': multiplications,
+        'peakMemoryBytes': peakMemory
+    }
+
+
+def compareMethods(n, methods=None, onResult=None, parallel=False, timeout=COMPARE_TIMEOUT,
+                   maxWorkers=None, shouldStop=None):
+    """
+    多种方法比较：对同一n计时、统计基本操作次数并测量峰值内存
+    每个方法得到一条记录，status 为 ok / skipped / error / timeout / cancelled
+    parallel: 为True时每个方法在独立子进程中并发运行，总耗时约等于最慢的方法；
+              各方法争用CPU和内存带宽，计时会比顺序运行略偏大
+    timeout: 并行时单个方法的期限（秒），超时的子进程被强制结束
+    maxWorkers: 并行时同时运行的子进程数，默认为CPU核数
+    onResult: 可选回调 onResult(记录)，每个方法完成后调用（并行时按完成顺序）
+    shouldStop: 可选回调，返回True时结束尚未完成的方法
+    返回：按方法表顺序排列的记录列表
+    """
+    methods = FIBONACCI_METHODS if methods is None else methods
+    records = {}
+    
+    def complete(methodName, record):
+        record = {'name': methodName, 'n': n, **record}
+        records[methodName] = record
+        if onResult is not None:
+            onResult(record)
+    
+    pending = []
+    for methodName, _, _ in methods:
+        if methodName == "递归法" and n > RECURSIVE_MAX_N:
+            complete(methodName, {'status': "skipped", 'reason': f"n={n}太大，递归会非常慢"})
+        else:
+            pending.append(methodName)
+    
+    if not parallel:
+        for methodName in pending:
+            if shouldStop is not None and shouldStop():
+                complete(methodName, {'status': "cancelled", 'reason': "任务已取消"})
+                continue
+            try:
+                complete(methodName, profileMethod(methodName, n))
+            except Exception as e:
+                complete(methodName, {'status': "error", 'reason': str(e)})
+    else:
+        maxWorkers = maxWorkers or os.cpu_count() or 1
+        running = {}
+        try:
+            while pending or running:
+                while pending and len(running) < maxWorkers:
+                    methodName = pending.pop(0)
+                    running[methodName] = TimedProcess(profileMethod, (methodName, n, intBackend), timeout).start()
+                
+                for methodName, task in list(running.items()):
+                    if shouldStop is not None and shouldStop():
+                        task.kill("cancelled")
+                    if not task.poll():
+                        continue
+                    del running[methodName]
+                    if task.status == "ok":
+                        complete(methodName, task.result)
+                    elif task.status == "timeout":
+                        complete(methodName, {'status': "timeout", 'reason': f"超过{timeout}秒"})
+                    elif task.status == "cancelled":
+                        complete(methodName, {'status': "cancelled", 'reason': "任务已取消"})
+                    else:
+                        complete(methodName, {'status': "error", 'reason': task.result})
+                time.sleep(PROCESS_POLL_INTERVAL)
+        finally:
+            # 回调抛出异常（如界面取消）时也要结束剩余子进程
+            for task in running.values():
+                task.kill()
+    
+    return [records[methodName] for methodName, _, _ in methods if methodName in records]
+
+
+def findMaxIndex(bound, crossCheck=None, shouldStop=None):
+    """
+    找不超过bound的最大斐波那契数序号（对数估计 + 快速倍增修正）
+    crossCheck为None时，上界不超过 ITERATIVE_SCAN_MAX_BITS 位才额外逐项迭代交叉验证
+    shouldStop: 可选回调，返回True时放弃逐项迭代
+    返回：结果字典（bound、n、value、solveMs、scanN、scanMs），未做逐项迭代时 scanN 为 None
+    """
+    startTime = time.perf_counter()
+    n, value = findMaxFibonacciIndex(bound)
+    result = {
+        "bound": bound, "n": n, "value": value,
+        "solveMs": (time.perf_counter() - startTime) * 1000, "scanN": None, "scanMs": None
+    }
+    
+    if crossCheck is None:
+        crossCheck = bound.bit_length() <= ITERATIVE_SCAN_MAX_BITS
+    if crossCheck:
+        startTime = time.perf_counter()
+        stream = FibonacciStream(start=1)
+        while stream.peekNext() <= bound:
+            next(stream)
+            if stream.index % 10000 == 0 and shouldStop is not None and shouldStop():
+                return result
+        result.update(scanN=stream.index, scanMs=(time.perf_counter() - startTime) * 1000)
+    return result
+
+
+def timeBudgetMethod(methodName, func, model, budget=30, onSample=None, shouldStop=None):
+    """
+    单个方法的时间预算搜索，在 findMaxInTimeBudget 的结果上补充方法名和搜索总耗时
+    """
+    startTime = time.perf_counter()
+    result = findMaxInTimeBudget(func, budget, model, onSample=onSample, shouldStop=shouldStop)
+    result.update(name=methodName, totalTime=time.perf_counter() - startTime)
+    return result
+
+
+def timeBudgetSearch(budget=30, methods=None, onSample=None, shouldStop=None):
+    """
+    对多个方法做时间预算搜索
+    onSample: 可选回调 onSample(方法名, n, 耗时)
+    返回：每个方法一个结果字典
+    """
+    results = []
+    for methodName, func, model in (TIME_BUDGET_METHODS if methods is None else methods):
+        sampleCallback = None
+        if onSample is not None:
+            sampleCallback = lambda n, t, name=methodName: onSample(name, n, t)
+        results.append(timeBudgetMethod(methodName, func, model, budget, sampleCallback, shouldStop))
+        if shouldStop is not None and shouldStop():
+            break
+    return results
+
+
+def formulaErrorSearch(start=1, stop=FORMULA_SCAN_MAX_N, precisions=FORMULA_PRECISIONS):
+    """
+    找出公式法在 [start, stop] 内各精度下第一个出现误差的n，并给出误差增长曲线
+    返回：每种精度一条记录，见 scanFormulaPrecisions；另附扫描耗时 elapsedMs
+    """
+    startTime = time.perf_counter()
+    records = scanFormulaPrecisions(start, stop, precisions)
+    elapsedMs = (time.perf_counter() - startTime) * 1000
+    for record in records:
+        record["elapsedMs"] = elapsedMs
+    return records
+
+
+# ==================== 命令行部分 ====================
+
+def jsonSafe(value, maxDigits=OUTPUT_MAX_DIGITS):
+    """
+    把结果转成可JSON序列化的形式，超长整数按 formatNumber 截断为字符串
+    inf/nan 不是合法JSON，转成字符串 "inf" / "-inf" / "nan"
+    """
+    if isinstance(value, dict):
+        return {key: jsonSafe(item, maxDigits) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonSafe(item, maxDigits) for item in value]
+    if isinstance(value, int) and not isinstance(value, bool) and decimalDigits(value) > maxDigits:
+        return formatNumber(value, maxDigits)
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    return value
+
+
+def formatRecord(record, maxDigits=OUTPUT_MAX_DIGITS):
+    """把结果字典格式化为一行 key=value 文本，省略采样等列表字段"""
+    return ", ".join(f"{key}={formatNumber(value, maxDigits)}" for key, value in record.items()
+                     if not isinstance(value, (list, tuple, dict)))
+
+
+def buildParser():
+    """命令行参数解析器"""
+    parser = argparse.ArgumentParser(description="斐波那契数列计算实验（命令行版）")
+    parser.add_argument("--json", action="store_true", help="以JSON输出结构化结果")
+    parser.add_argument("--max-digits", type=int, default=OUTPUT_MAX_DIGITS,
+                        help="超过此位数的整数只输出首尾")
+    parser.add_argument("--backend", choices=list(INT_BACKENDS), default=intBackend,
+                        help="大整数后端")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    compareParser = subparsers.add_parser("compare", help="多种方法比较")
+    compareParser.add_argument("n", type=int)
+    compareParser.add_argument("--methods", nargs="+", help="方法的显示名或函数名，默认全部")
+    compareParser.add_argument("--parallel", action="store_true", help="各方法在独立子进程中并发运行")
+    compareParser.add_argument("--timeout", type=float, default=COMPARE_TIMEOUT, help="并行时单个方法的期限（秒）")
+    
+    findMaxParser = subparsers.add_parser("find-max", help="不超过最大整数的最大斐波那契数序号")
+    findMaxParser.add_argument("--bits", type=int, help="有符号整数位宽，默认使用 sys.maxsize")
+    
+    budgetParser = subparsers.add_parser("budget", help="时间预算内能计算的最大序号")
+    budgetParser.add_argument("--seconds", type=float, default=30)
+    budgetParser.add_argument("--methods", nargs="+", help="方法的显示名或函数名，默认全部")
+    
+    formulaParser = subparsers.add_parser("formula-error", help="公式法出现误差的最小n")
+    formulaParser.add_argument("--start", type=int, default=1)
+    formulaParser.add_argument("--stop", type=int, default=FORMULA_SCAN_MAX_N)
+    formulaParser.add_argument("--precisions", nargs="+", default=FORMULA_PRECISIONS,
+                               help="float32 / float64 / longdouble / decimal:k")
+    
+    recurrenceParser = subparsers.add_parser("recurrence", help="k阶线性递推的第n项（Kitamasa法）")
+    recurrenceParser.add_argument("n", type=int)
+    recurrenceParser.add_argument("--coeffs", type=int, nargs="+", required=True,
+                                  help="递推系数 c1 .. ck，a(n) = c1*a(n-1) + ... + ck*a(n-k)")
+    recurrenceParser.add_argument("--initial", type=int, nargs="+", required=True, help="初始值 a(0) .. a(k-1)")
+    recurrenceParser.add_argument("--mod", type=int)
+    
+    tableParser = subparsers.add_parser("build-table", help="生成预计算查表文件")
+    tableParser.add_argument("--max-n", type=int, default=FIB_TABLE_MAX_N)
+    tableParser.add_argument("--path", default=FIB_TABLE_PATH)
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    setIntBackend(args.backend)
+    
+    try:
+        if args.command == "compare":
+            if args.n < 0:
+                raise ValueError("n值必须为非负整数")
+            result = compareMethods(args.n, selectMethods(FIBONACCI_METHODS, args.methods),
+                                    parallel=args.parallel, timeout=args.timeout)
+        elif args.command == "find-max":
+            if args.bits is not None and args.bits < 2:
+                raise ValueError("整数位宽必须为不小于2的整数")
+            bound = sys.maxsize if args.bits is None else (1 << (args.bits - 1)) - 1
+            result = findMaxIndex(bound)
+        elif args.command == "budget":
+            result = timeBudgetSearch(args.seconds, selectMethods(TIME_BUDGET_METHODS, args.methods))
+        elif args.command == "recurrence":
+            startTime = time.perf_counter()
+            value = linearRecurrence(args.coeffs, args.initial, args.n, args.mod)
+            result = {"n": args.n, "coeffs": args.coeffs, "initial": args.initial, "mod": args.mod,
+                      "value": value, "elapsedMs": (time.perf_counter() - startTime) * 1000}
+        elif args.command == "build-table":
+            if args.max_n < 0:
+                raise ValueError("最大序号必须为非负整数")
+            startTime = time.perf_counter()
+            buildFibonacciTable(args.path, args.max_n)
+            result = {"path": args.path, "maxN": args.max_n, "bytes": os.path.getsize(args.path),
+                      "elapsedTime": time.perf_counter() - startTime}
+        else:
+            result = formulaErrorSearch(args.start, args.stop, args.precisions)
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    
+    if args.json:
+        print(json.dumps(jsonSafe(result, args.max_digits), ensure_ascii=False, indent=2, allow_nan=False))
+    else:
+        for record in (result if isinstance(result, list) else [result]):
+            print(formatRecord(record, args.max_digits))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())